@@ -9,20 +9,16 @@ Executes the multi-agent LangGraph pipeline for content generation.
 
 import argparse
 import sys
+import traceback
 from pathlib import Path
 
 from src.orchestrator import AgentOrchestrator
-from src.utils import write_json_output, load_product_from_dataset
+from src.utils import write_json_outputs, load_product_from_dataset, load_products_from_dataset
 from src.config import DEFAULT_DATASET_PATH, OUTPUT_DIR
 from src.validators import validate_output_schema
 
 
-def parse_arguments():
-    """Parse command line arguments."""
-    parser = argparse.ArgumentParser(
-        description="Kasparro AI - Multi-Agent Content Generation System",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+CLI_EXAMPLES = """
 Examples:
   # Use default dataset
   python main.py
@@ -35,7 +31,18 @@ Examples:
   
   # Use custom output directory
   python main.py --output-dir custom_output/
-        """
+  
+  # Generate pages for every product in the dataset
+  python main.py --batch
+"""
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Kasparro AI - Multi-Agent Content Generation System",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=CLI_EXAMPLES
     )
     
     parser.add_argument(
@@ -59,9 +66,105 @@ Examples:
         help=f'Output directory for generated files (default: {OUTPUT_DIR})'
     )
     
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Process every product in the dataset (outputs go to <output-dir>/product_<index>/)'
+    )
+    
     return parser.parse_args()
 
 
+def validate_results(results: dict) -> None:
+    """
+    Validate the three generated pages, printing one line per page.
+    
+    Raises:
+        ValueError: If any page fails validation
+    """
+    validate_output_schema(results["faq"], "faq")
+    print("  ✓ FAQ validation passed (count >= 15)")
+    
+    validate_output_schema(results["product"], "product")
+    print("  ✓ Product page validation passed")
+    
+    validate_output_schema(results["comparison"], "comparison")
+    print("  ✓ Comparison page validation passed")
+
+
+def save_results(results: dict, output_dir: str) -> None:
+    """Write the three generated pages to output_dir, printing each filename."""
+    outputs = [
+        (results["faq"], "faq.json"),
+        (results["product"], "product_page.json"),
+        (results["comparison"], "comparison_page.json"),
+    ]
+    
+    write_json_outputs(outputs, output_dir)
+    for _, filename in outputs:
+        print(f"  ✓ {filename}")
+
+
+def run_batch_mode(args) -> list:
+    """
+    Generate pages for every product in the dataset in one run.
+    
+    Each product's pages are written to <output-dir>/product_<index>/.
+    """
+    print(f"\nLoading dataset: {args.dataset}")
+    try:
+        products = load_products_from_dataset(args.dataset)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"❌ Error loading dataset: {e}")
+        sys.exit(1)
+    
+    print(f"\n✓ Loaded {len(products)} product(s)")
+    
+    print("\n" + "-" * 60)
+    print("Executing agents for all products...")
+    print("-" * 60)
+    
+    orchestrator = AgentOrchestrator()
+    all_results = orchestrator.run_batch(products)
+    
+    failed = 0
+    for index, (product_data, results) in enumerate(zip(products, all_results)):
+        product_dir = str(Path(args.output_dir) / f"product_{index}")
+        
+        print("\n" + "-" * 60)
+        print(f"[{index}] {product_data.get('name', '<unnamed>')} → {product_dir}")
+        print("-" * 60)
+        
+        error = results["error"]
+        if error is not None:
+            # Keep writing the other products' pages
+            print(f"\n❌ Pipeline execution failed: {error}")
+            traceback.print_exception(type(error), error, error.__traceback__)
+            failed += 1
+            continue
+        
+        try:
+            validate_results(results)
+            save_results(results, product_dir)
+        except ValueError as e:
+            print(f"\n❌ Validation failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"\n❌ Error writing outputs: {e}")
+            failed += 1
+    
+    print("\n" + "=" * 60)
+    print(f"✓ Pages generated for {len(all_results) - failed} product(s)!")
+    print(f"✓ Outputs saved to: {Path(args.output_dir).absolute()}")
+    print("=" * 60)
+    
+    if failed:
+        print(f"\n❌ {failed} product(s) failed; see errors above")
+        sys.exit(1)
+    
+    return all_results
+
+
 def main():
     """
     Main function to run the agentic content generation system.
@@ -73,6 +176,9 @@ def main():
     print("Kasparro AI - Agentic Content Generation System")
     print("=" * 60)
     
+    if args.batch:
+        return run_batch_mode(args)
+    
     # Load product data from dataset
     print(f"\nLoading dataset: {args.dataset}")
     try:
@@ -94,8 +200,9 @@ def main():
     
     print("\nAgent execution order based on DAG dependencies:")
     print("  parser (no deps) → runs first")
-    print("  questions, product, comparison (dep: parser) → run after parser")
+    print("  questions, product, competitor (dep: parser) → run in parallel after parser")
     print("  faq (deps: parser, questions) → runs after questions")
+    print("  comparison (deps: parser, competitor) → runs in parallel with faq")
     
     # Run the DAG execution
     print("\n" + "-" * 60)
@@ -106,7 +213,6 @@ def main():
         results = orchestrator.execute_dag(product_data)
     except Exception as e:
         print(f"\n❌ Pipeline execution failed: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
     
@@ -123,15 +229,7 @@ def main():
     print("-" * 60)
     
     try:
-        validate_output_schema(results["faq"], "faq")
-        print("  ✓ FAQ validation passed (count >= 15)")
-        
-        validate_output_schema(results["product"], "product")
-        print("  ✓ Product page validation passed")
-        
-        validate_output_schema(results["comparison"], "comparison")
-        print("  ✓ Comparison page validation passed")
-        
+        validate_results(results)
     except ValueError as e:
         print(f"\n❌ Validation failed: {e}")
         sys.exit(1)
@@ -142,15 +240,7 @@ def main():
     print("-" * 60)
     
     try:
-        write_json_output(results["faq"], "faq.json", args.output_dir)
-        print("  ✓ faq.json")
-        
-        write_json_output(results["product"], "product_page.json", args.output_dir)
-        print("  ✓ product_page.json")
-        
-        write_json_output(results["comparison"], "comparison_page.json", args.output_dir)
-        print("  ✓ comparison_page.json")
-        
+        save_results(results, args.output_dir)
     except Exception as e:
         print(f"\n❌ Error writing outputs: {e}")
         sys.exit(1)
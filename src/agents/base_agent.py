@@ -6,7 +6,7 @@ Enables autonomous agent execution with dependency tracking.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, Iterable
 
 
 class BaseAgent(ABC):
@@ -23,22 +23,22 @@ class BaseAgent(ABC):
             agent_id: The agent's unique identifier
         """
         self.agent_id = agent_id
-        self.dependencies: List[str] = []
+        self.dependencies: FrozenSet[str] = frozenset()
         self.status: str = "pending"  # pending, running, completed
         self.output: Any = None
     
-    @abstractmethod
-    def can_execute(self, completed_agents: List[str]) -> bool:
+    def can_execute(self, completed_agents: Iterable[str]) -> bool:
         """
         Check if this agent's dependencies are satisfied.
         
         Args:
-            completed_agents: List of agent IDs that have completed execution
+            completed_agents: Agent IDs that have completed execution
+                (a set avoids re-hashing on every check)
             
         Returns:
             True if all dependencies are satisfied, False otherwise
         """
-        pass
+        return self.dependencies.issubset(completed_agents)
     
     @abstractmethod
     def execute(self, shared_data: Dict[str, Any]) -> Any:
@@ -4,11 +4,12 @@ Comparison Agent Module
 Agent responsible for generating comparison content between products using LLM.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet
 from src.agents.base_agent import BaseAgent
 from src.models.schemas import Product
 from src.templates.template_definitions import ComparisonTemplate
-from src.llm_client import llm_client
+from src.llm_client import get_llm_client
+from src.config import COMPETITOR_MAX_TOKENS, COMPARISON_MAX_TOKENS
 
 
 class ComparisonAgent(BaseAgent):
@@ -20,20 +21,7 @@ class ComparisonAgent(BaseAgent):
     def __init__(self):
         """Initialize the ComparisonAgent with agent_id 'comparison'."""
         super().__init__(agent_id="comparison")
-        self.dependencies: List[str] = ["parser"]
-    
-    def can_execute(self, completed_agents: List[str]) -> bool:
-        """
-        Check if this agent can execute.
-        Returns True only if the parser agent has completed.
-        
-        Args:
-            completed_agents: List of agent IDs that have completed execution
-            
-        Returns:
-            True if 'parser' is in completed_agents
-        """
-        return "parser" in completed_agents
+        self.dependencies: FrozenSet[str] = frozenset({"parser"})
     
     def execute(self, shared_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -46,6 +34,7 @@ class ComparisonAgent(BaseAgent):
             Structured comparison dictionary built using ComparisonTemplate
         """
         self.status = "running"
+        llm_client = get_llm_client()
         
         product_a: Product = shared_data["parser"]
         
@@ -53,12 +42,7 @@ class ComparisonAgent(BaseAgent):
         system_prompt = """You are a product data specialist. Create realistic fictional competitor products for comparison."""
         
         user_prompt = f"""Given this real product:
-Name: {product_a.name}
-Concentration: {product_a.concentration}
-Skin Type: {', '.join(product_a.skin_type)}
-Ingredients: {', '.join(product_a.key_ingredients)}
-Benefits: {', '.join(product_a.benefits)}
-Price: {product_a.price}
+{product_a.prompt_block}
 
 Create a fictional competitor product (Product B) with this exact JSON structure:
 {{
@@ -74,7 +58,7 @@ Create a fictional competitor product (Product B) with this exact JSON structure
 
 Make it realistic and competitive. Return ONLY valid JSON."""
         
-        product_b_data = llm_client.generate_json(system_prompt, user_prompt, max_tokens=800)
+        product_b_data = llm_client.generate_json(system_prompt, user_prompt, max_tokens=COMPETITOR_MAX_TOKENS)
         
         # Ensure all required fields exist with defaults
         product_b_data.setdefault("name", "Competitor Vitamin C Serum")
@@ -93,19 +77,11 @@ Make it realistic and competitive. Return ONLY valid JSON."""
         
         user_prompt = f"""Compare these two products:
 
-Product A: {product_a.name}
-- Concentration: {product_a.concentration}
-- Ingredients: {', '.join(product_a.key_ingredients)}
-- Benefits: {', '.join(product_a.benefits)}
-- Price: {product_a.price}
-- Skin Type: {', '.join(product_a.skin_type)}
+Product A:
+{product_a.prompt_block}
 
-Product B: {product_b.name}
-- Concentration: {product_b.concentration}
-- Ingredients: {', '.join(product_b.key_ingredients)}
-- Benefits: {', '.join(product_b.benefits)}
-- Price: {product_b.price}
-- Skin Type: {', '.join(product_b.skin_type)}
+Product B:
+{product_b.prompt_block}
 
 Generate a JSON comparison with:
 {{
@@ -130,13 +106,13 @@ Generate a JSON comparison with:
 
 Return ONLY valid JSON."""
         
-        comparison_metrics = llm_client.generate_json(system_prompt, user_prompt, max_tokens=1200)
+        comparison_metrics = llm_client.generate_json(system_prompt, user_prompt, max_tokens=COMPARISON_MAX_TOKENS)
         
         # Structure using template
         template = ComparisonTemplate()
         comparison_output = template.build(
-            product_a.model_dump(),
-            product_b.model_dump(),
+            product_a.as_dict,
+            product_b.as_dict,
             [comparison_metrics]
         )
         
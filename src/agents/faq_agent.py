@@ -4,11 +4,12 @@ FAQ Agent Module
 Agent responsible for generating FAQ content from product and question data using LLM.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List
 from src.agents.base_agent import BaseAgent
 from src.models.schemas import Product, Question
 from src.templates.template_definitions import FAQTemplate
-from src.llm_client import llm_client
+from src.llm_client import get_llm_client
+from src.config import FAQ_MAX_TOKENS
 
 
 class FAQGenerationAgent(BaseAgent):
@@ -20,20 +21,7 @@ class FAQGenerationAgent(BaseAgent):
     def __init__(self):
         """Initialize the FAQGenerationAgent with agent_id 'faq'."""
         super().__init__(agent_id="faq")
-        self.dependencies: List[str] = ["parser", "questions"]
-    
-    def can_execute(self, completed_agents: List[str]) -> bool:
-        """
-        Check if this agent can execute.
-        Returns True only if all dependencies have completed.
-        
-        Args:
-            completed_agents: List of agent IDs that have completed execution
-            
-        Returns:
-            True if all dependencies are in completed_agents
-        """
-        return all(dep in completed_agents for dep in self.dependencies)
+        self.dependencies: FrozenSet[str] = frozenset({"parser", "questions"})
     
     def execute(self, shared_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -46,12 +34,13 @@ class FAQGenerationAgent(BaseAgent):
             Structured FAQ dictionary built using FAQTemplate
         """
         self.status = "running"
+        llm_client = get_llm_client()
         
         product: Product = shared_data["parser"]
         questions: List[Question] = shared_data["questions"]
         
         # Format questions for LLM
-        questions_text = "\n".join([f"{i+1}. [{q.category}] {q.text}" for i, q in enumerate(questions)])
+        questions_text = "\n".join([f"{i+1}. [{q.category.name}] {q.text}" for i, q in enumerate(questions)])
         
         system_prompt = """You are a skincare product expert and customer service specialist.
 Generate helpful, accurate, and engaging FAQ answers based on product data.
@@ -59,15 +48,7 @@ Answers should be informative yet concise (2-4 sentences each)."""
         
         user_prompt = f"""Generate FAQ answers for this product:
 
-Product Data:
-Name: {product.name}
-Concentration: {product.concentration}
-Skin Type: {', '.join(product.skin_type)}
-Ingredients: {', '.join(product.key_ingredients)}
-Benefits: {', '.join(product.benefits)}
-Usage: {product.how_to_use}
-Side Effects: {product.side_effects}
-Price: {product.price}
+{product.prompt_block}
 
 Questions to answer:
 {questions_text}
@@ -80,7 +61,7 @@ Return a JSON array with this structure:
 
 Base all answers on the product data provided. Be helpful and accurate. Return ONLY valid JSON."""
         
-        faq_items = llm_client.generate_json(system_prompt, user_prompt, max_tokens=2000)
+        faq_items = llm_client.generate_json(system_prompt, user_prompt, max_tokens=FAQ_MAX_TOKENS)
         
         # Use FAQTemplate to build final output
         faq_output = FAQTemplate.build(faq_items)
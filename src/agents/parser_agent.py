@@ -4,7 +4,7 @@ Parser Agent Module
 Agent responsible for parsing and extracting information from input content.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet
 from src.agents.base_agent import BaseAgent
 from src.models.schemas import Product
 
@@ -18,20 +18,7 @@ class DataParserAgent(BaseAgent):
     def __init__(self):
         """Initialize the DataParserAgent with agent_id 'parser'."""
         super().__init__(agent_id="parser")
-        self.dependencies: List[str] = []  # No dependencies, runs first
-    
-    def can_execute(self, completed_agents: List[str]) -> bool:
-        """
-        Check if this agent can execute.
-        Always returns True as this agent has no dependencies.
-        
-        Args:
-            completed_agents: List of agent IDs that have completed execution
-            
-        Returns:
-            Always True
-        """
-        return True
+        self.dependencies: FrozenSet[str] = frozenset()  # No dependencies, runs first
     
     def execute(self, shared_data: Dict[str, Any]) -> Product:
         """
@@ -4,11 +4,12 @@ Product Agent Module
 Agent responsible for generating product page content using LLM.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet
 from src.agents.base_agent import BaseAgent
 from src.models.schemas import Product
 from src.templates.template_definitions import ProductTemplate
-from src.llm_client import llm_client
+from src.llm_client import get_llm_client
+from src.config import PRODUCT_PAGE_MAX_TOKENS
 
 
 class ProductPageAgent(BaseAgent):
@@ -20,20 +21,7 @@ class ProductPageAgent(BaseAgent):
     def __init__(self):
         """Initialize the ProductPageAgent with agent_id 'product'."""
         super().__init__(agent_id="product")
-        self.dependencies: List[str] = ["parser"]
-    
-    def can_execute(self, completed_agents: List[str]) -> bool:
-        """
-        Check if this agent can execute.
-        Returns True only if the parser agent has completed.
-        
-        Args:
-            completed_agents: List of agent IDs that have completed execution
-            
-        Returns:
-            True if 'parser' is in completed_agents
-        """
-        return "parser" in completed_agents
+        self.dependencies: FrozenSet[str] = frozenset({"parser"})
     
     def execute(self, shared_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -46,6 +34,7 @@ class ProductPageAgent(BaseAgent):
             Structured product page dictionary built using ProductTemplate
         """
         self.status = "running"
+        llm_client = get_llm_client()
         
         product: Product = shared_data["parser"]
         
@@ -55,15 +44,7 @@ Write in a clear, engaging style that informs and persuades customers."""
         
         user_prompt = f"""Create product page content for:
 
-Product Data:
-Name: {product.name}
-Concentration: {product.concentration}
-Skin Type: {', '.join(product.skin_type)}
-Ingredients: {', '.join(product.key_ingredients)}
-Benefits: {', '.join(product.benefits)}
-Usage: {product.how_to_use}
-Side Effects: {product.side_effects}
-Price: {product.price}
+{product.prompt_block}
 
 Generate a JSON object with these fields:
 {{
@@ -76,13 +57,13 @@ Generate a JSON object with these fields:
 
 Write naturally, professionally. Base everything on the data provided. Return ONLY valid JSON."""
         
-        content = llm_client.generate_json(system_prompt, user_prompt, max_tokens=1500)
+        content = llm_client.generate_json(system_prompt, user_prompt, max_tokens=PRODUCT_PAGE_MAX_TOKENS)
         
         # Ensure all fields have defaults
         content.setdefault("description", f"{product.name} is a premium skincare product.")
         content.setdefault("benefits_section", product.benefits)
         content.setdefault("usage_section", product.how_to_use)
-        content.setdefault("ingredients_section", ", ".join(product.key_ingredients))
+        content.setdefault("ingredients_section", product.ingredients_str)
         content.setdefault("safety_section", product.side_effects)
         
         # Structure using template - use field names expected by ProductTemplate
@@ -4,10 +4,11 @@ Question Agent Module
 Agent responsible for generating questions from product content using LLM.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List
 from src.agents.base_agent import BaseAgent
 from src.models.schemas import Product, Question, QuestionCategory
-from src.llm_client import llm_client
+from src.llm_client import get_llm_client
+from src.config import QUESTIONS_MAX_TOKENS
 
 
 class QuestionGenerationAgent(BaseAgent):
@@ -20,20 +21,7 @@ class QuestionGenerationAgent(BaseAgent):
     def __init__(self):
         """Initialize the QuestionGenerationAgent with agent_id 'questions'."""
         super().__init__(agent_id="questions")
-        self.dependencies: List[str] = ["parser"]
-    
-    def can_execute(self, completed_agents: List[str]) -> bool:
-        """
-        Check if this agent can execute.
-        Returns True only if the parser agent has completed.
-        
-        Args:
-            completed_agents: List of agent IDs that have completed execution
-            
-        Returns:
-            True if 'parser' is in completed_agents
-        """
-        return "parser" in completed_agents
+        self.dependencies: FrozenSet[str] = frozenset({"parser"})
     
     def execute(self, shared_data: Dict[str, Any]) -> List[Question]:
         """
@@ -46,6 +34,7 @@ class QuestionGenerationAgent(BaseAgent):
             List of Question objects
         """
         self.status = "running"
+        llm_client = get_llm_client()
         
         product: Product = shared_data["parser"]
         
@@ -53,14 +42,7 @@ class QuestionGenerationAgent(BaseAgent):
 Questions should cover multiple categories: Informational, Safety, Usage, Purchase, and Comparison."""
         
         user_prompt = f"""Given this product data:
-Name: {product.name}
-Concentration: {product.concentration}
-Skin Type: {', '.join(product.skin_type)}
-Ingredients: {', '.join(product.key_ingredients)}
-Benefits: {', '.join(product.benefits)}
-Usage: {product.how_to_use}
-Side Effects: {product.side_effects}
-Price: {product.price}
+{product.prompt_block}
 
 Generate EXACTLY 15 user questions across these categories:
 - 4 INFORMATIONAL questions (about benefits, ingredients, what it does, concentration)
@@ -78,16 +60,18 @@ Return ONLY a JSON array with this structure:
 
 Use natural language. Make questions realistic and varied."""
         
-        response = llm_client.generate_json(system_prompt, user_prompt)
+        response = llm_client.generate_json(system_prompt, user_prompt, max_tokens=QUESTIONS_MAX_TOKENS)
         
-        # Convert to Question objects
-        questions: List[Question] = []
-        for q_data in response:
-            questions.append(Question(
-                id=q_data["id"],
-                text=q_data["text"],
-                category=q_data["category"]
-            ))
+        # Convert to Question objects (fields coerced here, so no validation needed;
+        # unknown category labels fall back to GENERAL)
+        questions: List[Question] = [
+            Question.model_construct(
+                id=str(q_data["id"]),
+                text=str(q_data["text"]),
+                category=QuestionCategory.parse(q_data["category"], default=QuestionCategory.GENERAL)
+            )
+            for q_data in response
+        ]
         
         self.output = questions
         self.mark_complete()
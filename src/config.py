@@ -8,9 +8,15 @@ Provides paths, environment settings, and system-wide constants.
 import os
 from pathlib import Path
 
+from dotenv import load_dotenv
+
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# Load .env before any setting below is read. Every module gets its settings
+# from here, so this is the one place that has to run first.
+load_dotenv()
+
 # Dataset Configuration
 DEFAULT_DATASET_PATH = os.getenv(
     "DEFAULT_DATASET_PATH",
@@ -25,5 +31,36 @@ AGENT_DELAY = int(os.getenv("AGENT_DELAY", "5"))
 DEFAULT_MAX_RETRIES = int(os.getenv("DEFAULT_MAX_RETRIES", "3"))
 DEFAULT_MAX_TOKENS = int(os.getenv("DEFAULT_MAX_TOKENS", "2000"))
 
+# Output token caps per LLM call. Each one leaves headroom over the largest
+# response its JSON schema produces; a truncated response is invalid JSON and
+# costs a full retry, so these should not be cut close.
+QUESTIONS_MAX_TOKENS = int(os.getenv("QUESTIONS_MAX_TOKENS", "1000"))
+# FAQ stays at the previous 2000 default: 15 multi-sentence answers plus JSON
+# overhead come close to it, and output lengths have not been measured yet
+FAQ_MAX_TOKENS = int(os.getenv("FAQ_MAX_TOKENS", "2000"))
+PRODUCT_PAGE_MAX_TOKENS = int(os.getenv("PRODUCT_PAGE_MAX_TOKENS", "1000"))
+COMPETITOR_MAX_TOKENS = int(os.getenv("COMPETITOR_MAX_TOKENS", "600"))
+COMPARISON_MAX_TOKENS = int(os.getenv("COMPARISON_MAX_TOKENS", "800"))
+
+# HTTP connection pool for the Groq client. Idle connections are kept well
+# past AGENT_DELAY so consecutive calls reuse the same TLS connection.
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "16"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+
+# Upper bound on Groq requests in flight at once across all threads
+LLM_MAX_CONCURRENT_REQUESTS = int(os.getenv("LLM_MAX_CONCURRENT_REQUESTS", "8"))
+
+# LLM response cache (in-memory LRU backed by files in LLM_CACHE_DIR)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", str(Path.home() / ".kasparro" / "cache"))
+LLM_CACHE_MEMORY_SIZE = int(os.getenv("LLM_CACHE_MEMORY_SIZE", "512"))
+
+# Send the three parser-dependent prompts (questions, product page, competitor)
+# to the LLM as a single batched request instead of three parallel ones
+BATCH_LLM_CALLS = os.getenv("BATCH_LLM_CALLS", "false").lower() == "true"
+
+# Maximum products processed concurrently by AgentOrchestrator.run_batch
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
 # Validation Configuration
 MIN_FAQ_COUNT = 15  # Hard requirement from assignment
@@ -6,9 +6,12 @@ LLM handles intelligent content generation; these are fallback/utility functions
 """
 
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from src.models.schemas import Product
 
+# First run of digits in a price string (e.g. "₹1299" -> "1299")
+_PRICE_RE = re.compile(r'\d+')
+
 
 def extract_product_summary(product: Product) -> str:
     """
@@ -20,7 +23,27 @@ def extract_product_summary(product: Product) -> str:
     Returns:
         Brief product summary string
     """
-    return f"{product.name} - {product.concentration} for {', '.join(product.skin_type)} skin"
+    return f"{product.name} - {product.concentration} for {product.skin_type_str} skin"
+
+
+def _parse_price(price: str) -> Optional[int]:
+    """
+    Extract the first integer amount from a price string.
+    
+    The common "₹<digits>" form is handled without the regex engine.
+    
+    Args:
+        price: Price string (e.g., "₹1299")
+        
+    Returns:
+        Integer amount, or None if the string has no digits
+    """
+    amount = price.lstrip("₹")
+    if amount.isascii() and amount.isdigit():
+        return int(amount)
+    
+    match = _PRICE_RE.search(price)
+    return int(match.group()) if match else None
 
 
 def calculate_price_difference(price_a: str, price_b: str) -> Dict[str, str]:
@@ -34,14 +57,12 @@ def calculate_price_difference(price_a: str, price_b: str) -> Dict[str, str]:
     Returns:
         Dictionary with difference amount and percentage
     """
-    match_a = re.search(r'\d+', price_a)
-    match_b = re.search(r'\d+', price_b)
+    a = _parse_price(price_a)
+    b = _parse_price(price_b)
     
-    if not match_a or not match_b:
+    if a is None or b is None:
         return {"difference": "N/A", "percentage": "N/A"}
     
-    a = int(match_a.group())
-    b = int(match_b.group())
     diff = abs(a - b)
     percent = round((diff / min(a, b)) * 100, 1) if min(a, b) > 0 else 0
     
@@ -59,7 +80,7 @@ def extract_common_ingredients(product_a: Product, product_b: Product) -> List[s
     Returns:
         List of common ingredients
     """
-    return list(set(product_a.key_ingredients) & set(product_b.key_ingredients))
+    return list(product_a.ingredients_set & product_b.ingredients_set)
 
 
 def extract_unique_ingredients(product: Product, other_product: Product) -> List[str]:
@@ -73,7 +94,7 @@ def extract_unique_ingredients(product: Product, other_product: Product) -> List
     Returns:
         List of unique ingredients
     """
-    return list(set(product.key_ingredients) - set(other_product.key_ingredients))
+    return list(product.ingredients_set - other_product.ingredients_set)
 
 
 def generate_content_block(block_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
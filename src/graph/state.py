@@ -24,6 +24,9 @@ class ContentGenerationState(TypedDict, total=False):
     # Question agent output
     questions: Optional[List[Question]]
     
+    # Competitor generated for the comparison page
+    competitor_product: Optional[Product]
+    
     # Final page outputs
     faq_output: Optional[Dict[str, Any]]
     product_output: Optional[Dict[str, Any]]
@@ -5,19 +5,25 @@ Defines the LangGraph workflow for the content generation pipeline.
 Uses StateGraph to orchestrate agents with DAG-based dependencies.
 """
 
-import os
 import time
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List
 from langgraph.graph import StateGraph, START, END
 
 from src.graph.state import ContentGenerationState
-from src.models.schemas import Product, Question
+from src.models.schemas import Product, Question, QuestionCategory
 from src.templates.template_definitions import FAQTemplate, ProductTemplate, ComparisonTemplate
-from src.llm_client import get_llm_client
-
-
-# Rate limiting delay between LLM calls (configurable via env)
-AGENT_DELAY = int(os.getenv("AGENT_DELAY", "5"))
+from src.validators import validate_parsed_product
+from src.llm_client import LLMRequest, get_llm_client
+from src.config import (
+    AGENT_DELAY,
+    BATCH_LLM_CALLS,
+    QUESTIONS_MAX_TOKENS,
+    FAQ_MAX_TOKENS,
+    PRODUCT_PAGE_MAX_TOKENS,
+    COMPETITOR_MAX_TOKENS,
+    COMPARISON_MAX_TOKENS,
+)
 
 
 def _delay_for_rate_limit():
@@ -34,6 +40,9 @@ def parse_product(state: ContentGenerationState) -> Dict[str, Any]:
     """
     Parser node: Validates and creates Product model from raw input.
     No LLM call - pure data transformation.
+    
+    Raises ValueError on incomplete product data, which stops the graph
+    before any of the LLM-backed nodes are scheduled.
     """
     print("Executing node: parse_product...")
     
@@ -49,31 +58,18 @@ def parse_product(state: ContentGenerationState) -> Dict[str, Any]:
         side_effects=raw_data.get("side_effects", ""),
         price=raw_data.get("price", "")
     )
+    validate_parsed_product(product)
     
     print("Node parse_product completed.")
     return {"parsed_product": product}
 
 
-def generate_questions(state: ContentGenerationState) -> Dict[str, Any]:
-    """
-    Question generation node: Uses LLM to generate categorized questions.
-    """
-    print("Executing node: generate_questions...")
-    
-    product = state["parsed_product"]
-    
+def _questions_request() -> LLMRequest:
+    """Build the LLM request for question generation."""
     system_prompt = """You are a product content specialist. Generate diverse, natural user questions about skincare products.
 Questions should cover multiple categories: Informational, Safety, Usage, Purchase, and Comparison."""
     
-    user_prompt = f"""Given this product data:
-Name: {product.name}
-Concentration: {product.concentration}
-Skin Type: {', '.join(product.skin_type)}
-Ingredients: {', '.join(product.key_ingredients)}
-Benefits: {', '.join(product.benefits)}
-Usage: {product.how_to_use}
-Side Effects: {product.side_effects}
-Price: {product.price}
+    user_prompt = """Given the product data above:
 
 Generate EXACTLY 15 user questions across these categories:
 - 4 INFORMATIONAL questions (about benefits, ingredients, what it does, concentration)
@@ -84,72 +80,86 @@ Generate EXACTLY 15 user questions across these categories:
 
 Return ONLY a JSON array with this structure:
 [
-  {{"id": "q1", "text": "question text here", "category": "INFORMATIONAL"}},
-  {{"id": "q2", "text": "question text here", "category": "SAFETY"}},
+  {"id": "q1", "text": "question text here", "category": "INFORMATIONAL"},
+  {"id": "q2", "text": "question text here", "category": "SAFETY"},
   ...
 ]
 
 Use natural language. Make questions realistic and varied."""
     
-    llm_client = get_llm_client()
-    response = llm_client.generate_json(system_prompt, user_prompt)
-    
-    questions = []
-    for q_data in response:
-        questions.append(Question(
-            id=q_data["id"],
-            text=q_data["text"],
-            category=q_data["category"]
-        ))
+    return system_prompt, user_prompt, QUESTIONS_MAX_TOKENS
+
+
+def _questions_from_response(response: List[Dict[str, Any]]) -> List[Question]:
+    """
+    Convert the LLM response into Question models.
     
-    print("Node generate_questions completed.")
-    _delay_for_rate_limit()
-    return {"questions": questions}
+    Text fields are coerced with str() and the category is resolved through
+    QuestionCategory.parse, so the models are built with model_construct,
+    skipping per-instance validation. A missing key raises KeyError; an
+    unknown category label falls back to QuestionCategory.GENERAL rather than
+    failing the whole run.
+    """
+    return [
+        Question.model_construct(
+            id=str(q_data["id"]),
+            text=str(q_data["text"]),
+            category=QuestionCategory.parse(q_data["category"], default=QuestionCategory.GENERAL)
+        )
+        for q_data in response
+    ]
 
 
-def generate_product_page(state: ContentGenerationState) -> Dict[str, Any]:
+def generate_questions(state: ContentGenerationState) -> Dict[str, Any]:
     """
-    Product page generation node: Uses LLM to create product page content.
+    Question generation node: Uses LLM to generate categorized questions.
     """
-    print("Executing node: generate_product_page...")
+    print("Executing node: generate_questions...")
     
     product = state["parsed_product"]
+    system_prompt, user_prompt, max_tokens = _questions_request()
     
+    llm_client = get_llm_client()
+    response = llm_client.generate_json(
+        system_prompt, user_prompt, max_tokens=max_tokens,
+        context=product.prompt_block
+    )
+    questions = _questions_from_response(response)
+    
+    print("Node generate_questions completed.")
+    _delay_for_rate_limit()
+    return {"questions": questions}
+
+
+def _product_page_request() -> LLMRequest:
+    """Build the LLM request for product page content."""
     system_prompt = """You are a professional product copywriter for skincare e-commerce.
 Generate compelling, accurate product page content based on provided data.
 Write in a clear, engaging style that informs and persuades customers."""
     
-    user_prompt = f"""Create product page content for:
-
-Product Data:
-Name: {product.name}
-Concentration: {product.concentration}
-Skin Type: {', '.join(product.skin_type)}
-Ingredients: {', '.join(product.key_ingredients)}
-Benefits: {', '.join(product.benefits)}
-Usage: {product.how_to_use}
-Side Effects: {product.side_effects}
-Price: {product.price}
+    user_prompt = """Create product page content for the product described above.
 
 Generate a JSON object with these fields:
-{{
+{
   "description": "2-3 sentence compelling product description",
   "benefits_section": "Formatted benefits text highlighting what it does",
   "usage_section": "Clear usage instructions with tips",
   "ingredients_section": "Explanation of key ingredients and their roles",
   "safety_section": "Safety information and precautions"
-}}
+}
 
 Write naturally, professionally. Base everything on the data provided. Return ONLY valid JSON."""
     
-    llm_client = get_llm_client()
-    content = llm_client.generate_json(system_prompt, user_prompt, max_tokens=1500)
-    
+    return system_prompt, user_prompt, PRODUCT_PAGE_MAX_TOKENS
+
+
+def _product_page_from_response(product: Product, content: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in defaults and structure the LLM content with ProductTemplate."""
     # Ensure all fields have defaults
     content.setdefault("description", f"{product.name} is a premium skincare product.")
     content.setdefault("benefits_section", product.benefits)
     content.setdefault("usage_section", product.how_to_use)
-    content.setdefault("ingredients_section", ", ".join(product.key_ingredients))
+    content.setdefault("ingredients_section", product.ingredients_str)
     content.setdefault("safety_section", product.side_effects)
     
     # Structure using template
@@ -165,34 +175,38 @@ Write naturally, professionally. Base everything on the data provided. Return ON
     }
     
     template = ProductTemplate()
-    product_output = template.build(product_data)
-    
-    print("Node generate_product_page completed.")
-    _delay_for_rate_limit()
-    return {"product_output": product_output}
+    return template.build(product_data)
 
 
-def generate_comparison_page(state: ContentGenerationState) -> Dict[str, Any]:
+def generate_product_page(state: ContentGenerationState) -> Dict[str, Any]:
     """
-    Comparison page generation node: Uses LLM to create fictional competitor and comparison.
+    Product page generation node: Uses LLM to create product page content.
     """
-    print("Executing node: generate_comparison_page...")
+    print("Executing node: generate_product_page...")
     
-    product_a = state["parsed_product"]
+    product = state["parsed_product"]
+    system_prompt, user_prompt, max_tokens = _product_page_request()
+    
+    llm_client = get_llm_client()
+    content = llm_client.generate_json(
+        system_prompt, user_prompt, max_tokens=max_tokens,
+        context=product.prompt_block
+    )
+    product_output = _product_page_from_response(product, content)
     
-    # Step 1: Generate fictional competitor
+    print("Node generate_product_page completed.")
+    _delay_for_rate_limit()
+    return {"product_output": product_output}
+
+
+def _competitor_request() -> LLMRequest:
+    """Build the LLM request for the fictional competitor product."""
     system_prompt = """You are a product data specialist. Create realistic fictional competitor products for comparison."""
     
-    user_prompt = f"""Given this real product:
-Name: {product_a.name}
-Concentration: {product_a.concentration}
-Skin Type: {', '.join(product_a.skin_type)}
-Ingredients: {', '.join(product_a.key_ingredients)}
-Benefits: {', '.join(product_a.benefits)}
-Price: {product_a.price}
+    user_prompt = """Given the real product described above:
 
 Create a fictional competitor product (Product B) with this exact JSON structure:
-{{
+{
   "name": "fictional product name (similar category but different brand)",
   "concentration": "different concentration of similar active ingredient",
   "skin_type": ["different skin types"],
@@ -201,13 +215,15 @@ Create a fictional competitor product (Product B) with this exact JSON structure
   "how_to_use": "usage instructions",
   "side_effects": "potential side effects",
   "price": "price in ₹ (make it 15-30% different)"
-}}
+}
 
 Make it realistic and competitive. Return ONLY valid JSON."""
     
-    llm_client = get_llm_client()
-    product_b_data = llm_client.generate_json(system_prompt, user_prompt, max_tokens=800)
-    
+    return system_prompt, user_prompt, COMPETITOR_MAX_TOKENS
+
+
+def _competitor_from_response(product_b_data: Dict[str, Any]) -> Product:
+    """Fill in defaults and validate the competitor as a Product model."""
     # Ensure all required fields exist with defaults
     product_b_data.setdefault("name", "Competitor Vitamin C Serum")
     product_b_data.setdefault("concentration", "15% Vitamin C")
@@ -218,28 +234,75 @@ Make it realistic and competitive. Return ONLY valid JSON."""
     product_b_data.setdefault("side_effects", "May cause mild irritation")
     product_b_data.setdefault("price", "₹799")
     
-    product_b = Product(**product_b_data)
+    return Product(**product_b_data)
+
+
+def generate_competitor_product(state: ContentGenerationState) -> Dict[str, Any]:
+    """
+    Competitor generation node: Uses LLM to create a fictional competitor product.
+    Kept separate from the comparison node so each parallel branch is one LLM call.
+    """
+    print("Executing node: generate_competitor_product...")
+    
+    product_a = state["parsed_product"]
+    system_prompt, user_prompt, max_tokens = _competitor_request()
     
+    llm_client = get_llm_client()
+    product_b_data = llm_client.generate_json(
+        system_prompt, user_prompt, max_tokens=max_tokens,
+        context=product_a.prompt_block
+    )
+    product_b = _competitor_from_response(product_b_data)
+    
+    print("Node generate_competitor_product completed.")
     _delay_for_rate_limit()
+    return {"competitor_product": product_b}
+
+
+def generate_parser_dependents(state: ContentGenerationState) -> Dict[str, Any]:
+    """
+    Batched node: Generates questions, product page and competitor in one LLM call.
+    Replaces the three separate parser dependents when BATCH_LLM_CALLS is enabled.
+    """
+    print("Executing node: generate_parser_dependents...")
     
-    # Step 2: Generate comparison analysis
-    system_prompt = """You are a product comparison expert. Analyze and compare skincare products objectively."""
+    product = state["parsed_product"]
+    
+    llm_client = get_llm_client()
+    questions_response, content, product_b_data = llm_client.generate_json_batch(
+        [_questions_request(), _product_page_request(), _competitor_request()],
+        context=product.prompt_block
+    )
     
-    user_prompt = f"""Compare these two products:
+    print("Node generate_parser_dependents completed.")
+    _delay_for_rate_limit()
+    return {
+        "questions": _questions_from_response(questions_response),
+        "product_output": _product_page_from_response(product, content),
+        "competitor_product": _competitor_from_response(product_b_data)
+    }
 
-Product A: {product_a.name}
-- Concentration: {product_a.concentration}
-- Ingredients: {', '.join(product_a.key_ingredients)}
-- Benefits: {', '.join(product_a.benefits)}
-- Price: {product_a.price}
-- Skin Type: {', '.join(product_a.skin_type)}
+
+def generate_comparison_page(state: ContentGenerationState) -> Dict[str, Any]:
+    """
+    Comparison page generation node: Uses LLM to compare the product with its competitor.
+    Depends on the competitor product being generated first.
+    """
+    print("Executing node: generate_comparison_page...")
+    
+    product_a = state["parsed_product"]
+    product_b = state["competitor_product"]
+    
+    system_prompt = """You are a product comparison expert. Analyze and compare skincare products objectively."""
+    
+    user_prompt = f"""Compare the product described above (Product A: {product_a.name}) with this competitor:
 
 Product B: {product_b.name}
 - Concentration: {product_b.concentration}
-- Ingredients: {', '.join(product_b.key_ingredients)}
-- Benefits: {', '.join(product_b.benefits)}
+- Ingredients: {product_b.ingredients_str}
+- Benefits: {product_b.benefits_str}
 - Price: {product_b.price}
-- Skin Type: {', '.join(product_b.skin_type)}
+- Skin Type: {product_b.skin_type_str}
 
 Generate a JSON comparison with:
 {{
@@ -265,13 +328,16 @@ Generate a JSON comparison with:
 Return ONLY valid JSON."""
     
     llm_client = get_llm_client()
-    comparison_metrics = llm_client.generate_json(system_prompt, user_prompt, max_tokens=1200)
+    comparison_metrics = llm_client.generate_json(
+        system_prompt, user_prompt, max_tokens=COMPARISON_MAX_TOKENS,
+        context=product_a.prompt_block
+    )
     
     # Structure using template
     template = ComparisonTemplate()
     comparison_output = template.build(
-        product_a.model_dump(),
-        product_b.model_dump(),
+        product_a.as_dict,
+        product_b.as_dict,
         [comparison_metrics]
     )
     
@@ -291,23 +357,13 @@ def generate_faq_page(state: ContentGenerationState) -> Dict[str, Any]:
     questions = state["questions"]
     
     # Format questions for LLM
-    questions_text = "\n".join([f"{i+1}. [{q.category}] {q.text}" for i, q in enumerate(questions)])
+    questions_text = "\n".join([f"{i+1}. [{q.category.name}] {q.text}" for i, q in enumerate(questions)])
     
     system_prompt = """You are a skincare product expert and customer service specialist.
 Generate helpful, accurate, and engaging FAQ answers based on product data.
 Answers should be informative yet concise (2-4 sentences each)."""
     
-    user_prompt = f"""Generate FAQ answers for this product:
-
-Product Data:
-Name: {product.name}
-Concentration: {product.concentration}
-Skin Type: {', '.join(product.skin_type)}
-Ingredients: {', '.join(product.key_ingredients)}
-Benefits: {', '.join(product.benefits)}
-Usage: {product.how_to_use}
-Side Effects: {product.side_effects}
-Price: {product.price}
+    user_prompt = f"""Generate FAQ answers for the product described above.
 
 Questions to answer:
 {questions_text}
@@ -321,7 +377,10 @@ Return a JSON array with this structure:
 Base all answers on the product data provided. Be helpful and accurate. Return ONLY valid JSON."""
     
     llm_client = get_llm_client()
-    faq_items = llm_client.generate_json(system_prompt, user_prompt, max_tokens=2000)
+    faq_items = llm_client.generate_json(
+        system_prompt, user_prompt, max_tokens=FAQ_MAX_TOKENS,
+        context=product.prompt_block
+    )
     
     # Use FAQTemplate to build final output
     faq_output = FAQTemplate.build(faq_items)
@@ -334,14 +393,23 @@ Base all answers on the product data provided. Be helpful and accurate. Return O
 # Workflow Graph Definition
 # ============================================================================
 
-def create_workflow() -> StateGraph:
+def create_workflow(batch_llm_calls: bool = False) -> StateGraph:
     """
     Create and compile the LangGraph workflow for content generation.
     
     DAG Structure:
     - parse_product (no deps) → runs first
-    - generate_questions, generate_product_page, generate_comparison_page (dep: parse_product)
+    - generate_questions, generate_product_page, generate_competitor_product (dep: parse_product)
     - generate_faq_page (deps: parse_product, generate_questions) → runs after questions
+    - generate_comparison_page (deps: parse_product, generate_competitor_product)
+    
+    LangGraph runs all nodes of a superstep concurrently but waits for the whole
+    step before starting the next one, so each branch is kept to one LLM call
+    per step: FAQ and comparison both start as soon as step two finishes.
+    
+    Args:
+        batch_llm_calls: Replace the three parser dependents with a single
+            generate_parser_dependents node that makes one batched LLM call
     
     Returns:
         Compiled LangGraph StateGraph
@@ -351,8 +419,12 @@ def create_workflow() -> StateGraph:
     
     # Add nodes
     workflow.add_node("parse_product", parse_product)
-    workflow.add_node("generate_questions", generate_questions)
-    workflow.add_node("generate_product_page", generate_product_page)
+    if batch_llm_calls:
+        workflow.add_node("generate_parser_dependents", generate_parser_dependents)
+    else:
+        workflow.add_node("generate_questions", generate_questions)
+        workflow.add_node("generate_product_page", generate_product_page)
+        workflow.add_node("generate_competitor_product", generate_competitor_product)
     workflow.add_node("generate_comparison_page", generate_comparison_page)
     workflow.add_node("generate_faq_page", generate_faq_page)
     
@@ -360,16 +432,23 @@ def create_workflow() -> StateGraph:
     # START -> parse_product
     workflow.add_edge(START, "parse_product")
     
-    # parse_product -> questions, product, comparison (parallel-capable)
-    workflow.add_edge("parse_product", "generate_questions")
-    workflow.add_edge("parse_product", "generate_product_page")
-    workflow.add_edge("parse_product", "generate_comparison_page")
-    
-    # questions -> faq (sequential dependency)
-    workflow.add_edge("generate_questions", "generate_faq_page")
+    if batch_llm_calls:
+        # parse_product -> one batched call for questions, product, competitor
+        workflow.add_edge("parse_product", "generate_parser_dependents")
+        workflow.add_edge("generate_parser_dependents", "generate_faq_page")
+        workflow.add_edge("generate_parser_dependents", "generate_comparison_page")
+    else:
+        # parse_product -> questions, product, competitor (run in parallel)
+        workflow.add_edge("parse_product", "generate_questions")
+        workflow.add_edge("parse_product", "generate_product_page")
+        workflow.add_edge("parse_product", "generate_competitor_product")
+        
+        # questions -> faq, competitor -> comparison (run in parallel)
+        workflow.add_edge("generate_questions", "generate_faq_page")
+        workflow.add_edge("generate_competitor_product", "generate_comparison_page")
+        workflow.add_edge("generate_product_page", END)
     
     # All terminal nodes -> END
-    workflow.add_edge("generate_product_page", END)
     workflow.add_edge("generate_comparison_page", END)
     workflow.add_edge("generate_faq_page", END)
     
@@ -377,5 +456,19 @@ def create_workflow() -> StateGraph:
     return workflow.compile()
 
 
+@lru_cache(maxsize=None)
+def get_workflow(batch_llm_calls: bool = False):
+    """
+    Return the compiled workflow for a DAG variant, compiling it only once.
+    
+    Args:
+        batch_llm_calls: Select the batched variant (see create_workflow)
+    
+    Returns:
+        Shared compiled LangGraph StateGraph
+    """
+    return create_workflow(batch_llm_calls=batch_llm_calls)
+
+
 # Create singleton workflow instance
-content_workflow = create_workflow()
+content_workflow = get_workflow(BATCH_LLM_CALLS)
@@ -1,38 +1,293 @@
 import os
-import json
+import re
 import time
-from groq import Groq
-from dotenv import load_dotenv
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+import httpx
+import orjson
+from groq import DefaultHttpxClient, Groq
 
-load_dotenv()
+from src.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_DIR,
+    LLM_CACHE_MEMORY_SIZE,
+    LLM_MAX_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_MAX_CONCURRENT_REQUESTS,
+)
+
+# (system_prompt, user_prompt, max_tokens) for one LLM call
+LLMRequest = Tuple[str, str, int]
+
+# Patterns used to repair malformed JSON replies, compiled once at import
+# Control characters except newlines, carriage returns and tabs
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+# Double-quoted string literals
+_STRING_LITERAL_RE = re.compile(r'"[^"]*"')
+
+
+def _escape_string_newlines(match: re.Match) -> str:
+    """Escape raw newlines inside a matched string literal (common LLM issue)."""
+    return match.group(0).replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _extract_json_span(text: str) -> str:
+    """
+    Return the first complete JSON array or object in text.
+    
+    Scans once from the first [ or {, tracking bracket depth and whether the
+    position is inside a string literal, and stops at the matching close.
+    Prose before or after the JSON, including any brackets in it, is dropped.
+    
+    Args:
+        text: Text containing a JSON value
+        
+    Returns:
+        The JSON span; the rest of the text from the opening bracket if it is
+        never closed; or text unchanged if it contains no bracket
+    """
+    starts = [i for i in (text.find('{'), text.find('[')) if i != -1]
+    if not starts:
+        return text
+    start = min(starts)
+    
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '[{':
+            depth += 1
+        elif char in ']}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    return text[start:]
+
+
+def _parse_json_response(response: str) -> Any:
+    """
+    Parse JSON from an LLM reply.
+    
+    Well-formed replies are parsed directly. Only when that fails is the
+    text repaired: surrounding prose is cut to the outermost JSON span,
+    stray control characters are removed and raw newlines inside strings
+    are escaped.
+    
+    Args:
+        response: Raw LLM response text
+        
+    Returns:
+        Parsed JSON value
+        
+    Raises:
+        orjson.JSONDecodeError: If the text is not valid JSON even after repair
+    """
+    # Clean up markdown code blocks if present
+    text = response.replace("```json", "").replace("```", "").strip()
+    
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+    
+    text = _extract_json_span(text)
+    text = _CONTROL_CHARS_RE.sub('', text)
+    text = _STRING_LITERAL_RE.sub(_escape_string_newlines, text)
+    
+    return orjson.loads(text)
+
+
+class ResponseCache:
+    """
+    Content-addressed cache for LLM responses.
+    
+    Entries live in an in-process LRU backed by one file per key on disk, so
+    re-running the pipeline on the same product skips the provider entirely.
+    Values are stored as serialized text and decoded on every hit, so callers
+    can freely mutate the objects they get back.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_items: int = 512):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory for on-disk entries (memory only if None)
+            max_memory_items: Maximum number of entries kept in memory
+        """
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hash the request parts into a cache key."""
+        return hashlib.sha256("\x00".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text for key, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        
+        if self.cache_dir is None:
+            return None
+        try:
+            value = (self.cache_dir / f"{key}.json").read_text(encoding="utf-8")
+        except OSError:
+            return None
+        except UnicodeDecodeError:
+            # Corrupt entry; drop it so the next write replaces it
+            self.discard(key)
+            return None
+        
+        self._remember(key, value)
+        return value
+    
+    def set(self, key: str, value: str) -> None:
+        """Store text under key in memory and on disk."""
+        self._remember(key, value)
+        
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so readers never see a partial entry
+            tmp_path = self.cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp_path.write_text(value, encoding="utf-8")
+            os.replace(tmp_path, self.cache_dir / f"{key}.json")
+        except OSError as e:
+            print(f"Could not write LLM cache entry: {e}")
+    
+    def discard(self, key: str) -> None:
+        """Remove key from memory and disk (e.g. after it failed to decode)."""
+        with self._lock:
+            self._memory.pop(key, None)
+        
+        if self.cache_dir is None:
+            return
+        try:
+            (self.cache_dir / f"{key}.json").unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not remove LLM cache entry: {e}")
+    
+    def _remember(self, key: str, value: str) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry if full."""
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+
+# Sampling temperature for generate_json retries after an unparseable reply
+_JSON_RETRY_TEMPERATURE = 0.7
+
+
+# Shared by every thread so parallel DAG branches, generate_many and batch
+# runs together never exceed the provider concurrency budget
+_request_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENT_REQUESTS)
+
+
+def _build_http_client() -> httpx.Client:
+    """
+    Create the pooled HTTP client shared by every Groq request.
+    
+    The SDK default drops idle connections after 5 seconds, which is the
+    same as the default AGENT_DELAY, so sequential calls would each pay a
+    fresh TCP + TLS handshake. A longer keep-alive lets them reuse one
+    connection, and the pool is sized for the parallel DAG branches.
+    """
+    return DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        )
+    )
 
 
 class LLMClient:
+    # Replaced per instance in __init__; None disables caching
+    cache: Optional[ResponseCache] = None
+    
     def __init__(self):
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
-        self.client = Groq(api_key=api_key)
+        self.client = Groq(api_key=api_key, http_client=_build_http_client())
         # Groq's fastest and most capable model
         self.model = "llama-3.3-70b-versatile"
         print(f"Using model: {self.model}")
+        
+        self.cache: Optional[ResponseCache] = (
+            ResponseCache(LLM_CACHE_DIR, LLM_CACHE_MEMORY_SIZE) if LLM_CACHE_ENABLED else None
+        )
     
-    def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 2000, max_retries: int = 3) -> str:
-        """Generate content using Groq with retry logic"""
+    def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 2000, max_retries: int = 3,
+                 context: Optional[str] = None, temperature: float = 0.7, use_cache: bool = True) -> str:
+        """
+        Generate content using Groq with retry logic.
+        
+        If context is given it is sent as the first message, ahead of the task
+        specific prompts. Calls that share the same context then share a prompt
+        prefix, which the provider can serve from its prompt cache.
+        
+        Only greedy (temperature 0) responses are cached, keyed by a hash of
+        the model, prompts and max_tokens; a non-zero temperature asks for a
+        fresh sample, so those calls always reach the provider. Pass
+        use_cache=False to skip the cache at temperature 0 as well.
+        """
+        cache_key = None
+        if use_cache and temperature == 0 and self.cache is not None:
+            cache_key = ResponseCache.make_key(
+                "text", self.model, context or "", system_prompt, user_prompt, max_tokens, temperature
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"LLM cache hit ({len(cached)} chars), skipping API call")
+                return cached
+        
+        messages = []
+        if context:
+            messages.append({"role": "system", "content": context})
+        messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": user_prompt})
         
         for attempt in range(max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    max_tokens=max_tokens,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content
+                # Hold a slot only for the request itself, not the backoff sleep
+                with _request_slots:
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                content = response.choices[0].message.content
+                if cache_key is not None and content is not None:
+                    self.cache.set(cache_key, content)
+                return content
             except Exception as e:
                 error_str = str(e)
                 if "rate" in error_str.lower() or "limit" in error_str.lower() or "429" in error_str:
@@ -45,9 +300,34 @@ class LLMClient:
         
         raise Exception("Max retries exceeded for rate limiting")
     
-    def generate_json(self, system_prompt: str, user_prompt: str, max_tokens: int = 2000, max_retries: int = 3) -> dict:
-        """Generate JSON output using Groq with retry logic for JSON parsing"""
-        import re
+    def generate_json(self, system_prompt: str, user_prompt: str, max_tokens: int = 2000, max_retries: int = 3,
+                      context: Optional[str] = None, use_cache: bool = True) -> dict:
+        """
+        Generate JSON output using Groq with retry logic for JSON parsing.
+        
+        Parsed results are cached by a hash of the model and full prompt, so an
+        identical request is answered from the cache. Pass use_cache=False to
+        always call the provider.
+        
+        The first attempt samples at temperature 0: every caller expects a
+        fixed JSON schema, and greedy decoding produces malformed output far
+        less often. Retries after a parse failure sample at a non-zero
+        temperature, since a greedy retry would replay the same bad output.
+        """
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = ResponseCache.make_key(self.model, context or "", system_prompt, user_prompt, max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                try:
+                    result = orjson.loads(cached)
+                except orjson.JSONDecodeError:
+                    # Truncated or corrupt entry: treat as a miss and overwrite it below
+                    print("Discarding unreadable LLM cache entry")
+                    self.cache.discard(cache_key)
+                else:
+                    print(f"LLM cache hit ({len(cached)} chars), skipping API call")
+                    return result
         
         # Add stronger JSON instruction to system prompt
         json_system_prompt = f"""{system_prompt}
@@ -61,32 +341,15 @@ CRITICAL INSTRUCTIONS:
 6. Do NOT include newlines within string values"""
         
         for attempt in range(max_retries):
-            response = self.generate(json_system_prompt, user_prompt, max_tokens)
-            
-            # Clean up markdown code blocks if present
-            response = response.replace("```json", "").replace("```", "").strip()
-            
-            # Try to extract JSON from response using regex
-            # Look for array [...] or object {...}
-            json_match = re.search(r'(\[[\s\S]*\]|\{[\s\S]*\})', response)
-            if json_match:
-                response = json_match.group(1)
-            
-            # Clean up common JSON issues
-            # Remove control characters except newlines and tabs
-            response = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', response)
-            
-            # Fix unescaped newlines within strings (common LLM issue)
-            # This replaces actual newlines between quotes with escaped \n
-            def fix_string_newlines(match):
-                return match.group(0).replace('\n', '\\n').replace('\r', '\\r')
-            
-            # Match strings and fix internal newlines
-            response = re.sub(r'"[^"]*"', fix_string_newlines, response)
+            # The parsed result is cached below; a raw-text cache hit here would
+            # replay an unparseable reply on every retry
+            temperature = 0.0 if attempt == 0 else _JSON_RETRY_TEMPERATURE
+            response = self.generate(json_system_prompt, user_prompt, max_tokens,
+                                     context=context, temperature=temperature, use_cache=False)
             
             try:
-                return json.loads(response)
-            except json.JSONDecodeError as e:
+                result = _parse_json_response(response)
+            except orjson.JSONDecodeError as e:
                 if attempt < max_retries - 1:
                     print(f"JSON parse error (attempt {attempt + 1}/{max_retries}): {e}")
                     print(f"Retrying with fresh LLM call...")
@@ -94,10 +357,111 @@ CRITICAL INSTRUCTIONS:
                 else:
                     print(f"Failed to parse JSON response after {max_retries} attempts: {response[:500]}...")
                     raise ValueError(f"Invalid JSON from LLM: {e}")
+            else:
+                if cache_key is not None:
+                    self.cache.set(cache_key, orjson.dumps(result).decode())
+                return result
+    
+    def generate_json_batch(self, requests: List[LLMRequest], max_retries: int = 3,
+                            context: Optional[str] = None) -> List[Any]:
+        """
+        Generate JSON outputs for several independent prompts with a single LLM call.
+        
+        The prompts are combined into one numbered multi-task request and the model
+        returns a JSON array holding one result per task. Falls back to one call per
+        prompt if the batched response does not contain a result for every task.
+        
+        Args:
+            requests: List of (system_prompt, user_prompt, max_tokens) tuples
+            max_retries: Retries for JSON parsing of each call
+            context: Shared context sent once ahead of all tasks (see generate)
+            
+        Returns:
+            Parsed JSON results in the same order as requests
+        """
+        if len(requests) == 1:
+            system_prompt, user_prompt, max_tokens = requests[0]
+            return [self.generate_json(system_prompt, user_prompt, max_tokens, max_retries, context)]
+        
+        tasks_text = "\n\n".join(
+            f"=== TASK {i} ===\nRole: {system_prompt}\n\n{user_prompt}"
+            for i, (system_prompt, user_prompt, _) in enumerate(requests, start=1)
+        )
+        
+        batch_system_prompt = """You complete several independent tasks in a single response.
+Handle each task exactly as if it had been asked on its own, following its role and instructions."""
+        
+        batch_user_prompt = f"""{tasks_text}
+
+Return ONLY a JSON array with exactly {len(requests)} elements.
+Element N must be the JSON result for TASK N, in task order."""
+        
+        max_tokens = sum(request[2] for request in requests)
+        results = self.generate_json(batch_system_prompt, batch_user_prompt, max_tokens, max_retries, context)
+        
+        if isinstance(results, list) and len(results) == len(requests):
+            return results
+        
+        print(f"Batched response did not contain {len(requests)} results. Falling back to one call per prompt...")
+        return self.generate_json_many(requests, max_retries=max_retries, context=context)
+    
+    def generate_many(self, requests: List[LLMRequest], max_retries: int = 3,
+                      context: Optional[str] = None, max_workers: Optional[int] = None) -> List[str]:
+        """
+        Run several independent generate calls concurrently.
+        
+        Args:
+            requests: List of (system_prompt, user_prompt, max_tokens) tuples
+            max_retries: Rate-limit retries for each call
+            context: Shared context sent with every call (see generate)
+            max_workers: Thread pool size (default: LLM_MAX_CONCURRENT_REQUESTS)
+            
+        Returns:
+            Generated texts in the same order as requests
+        """
+        return self._map_requests(
+            lambda s, u, t: self.generate(s, u, t, max_retries, context=context),
+            requests, max_workers
+        )
+    
+    def generate_json_many(self, requests: List[LLMRequest], max_retries: int = 3,
+                           context: Optional[str] = None, max_workers: Optional[int] = None) -> List[Any]:
+        """
+        Run several independent generate_json calls concurrently.
+        
+        Unlike generate_json_batch this makes one API call per request, so each
+        result is parsed and cached on its own.
+        
+        Args:
+            requests: List of (system_prompt, user_prompt, max_tokens) tuples
+            max_retries: Retries for JSON parsing of each call
+            context: Shared context sent with every call (see generate)
+            max_workers: Thread pool size (default: LLM_MAX_CONCURRENT_REQUESTS)
+            
+        Returns:
+            Parsed JSON results in the same order as requests
+        """
+        return self._map_requests(
+            lambda s, u, t: self.generate_json(s, u, t, max_retries, context),
+            requests, max_workers
+        )
+    
+    @staticmethod
+    def _map_requests(call: Callable[[str, str, int], Any], requests: List[LLMRequest],
+                      max_workers: Optional[int]) -> List[Any]:
+        """Apply call to every request on a thread pool, preserving order."""
+        if len(requests) <= 1:
+            return [call(*request) for request in requests]
+        
+        workers = min(max_workers or LLM_MAX_CONCURRENT_REQUESTS, len(requests))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda request: call(*request), requests))
 
 
 # Global instance cache (lazy initialization)
 _llm_client_instance = None
+# Parallel DAG nodes may ask for the client at the same moment
+_llm_client_lock = threading.Lock()
 
 
 def get_llm_client():
@@ -117,7 +481,9 @@ def get_llm_client():
         if not api_key:
             # Allow tests to run without API key
             return None
-        _llm_client_instance = LLMClient()
+        with _llm_client_lock:
+            if _llm_client_instance is None:
+                _llm_client_instance = LLMClient()
     
     return _llm_client_instance
 
@@ -125,6 +491,9 @@ def get_llm_client():
 def reset_llm_client():
     """Reset the LLM client instance (useful for testing)."""
     global _llm_client_instance
+    # The instance itself is the dirty flag: nothing to do if none was built
+    if _llm_client_instance is None:
+        return
     _llm_client_instance = None
 
 
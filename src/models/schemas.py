@@ -4,8 +4,10 @@ Data Schemas Module
 Pydantic models for data validation.
 """
 
-from typing import List, Optional, Dict
-from pydantic import BaseModel, Field
+import sys
+from functools import cached_property
+from typing import Any, FrozenSet, List, Optional, Dict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
 
@@ -16,10 +18,53 @@ class QuestionCategory(str, Enum):
     USAGE = "Usage"
     PURCHASE = "Purchase"
     COMPARISON = "Comparison"
+    # Fallback for labels the LLM invents; never requested in prompts
+    GENERAL = "General"
+    
+    @classmethod
+    def parse(cls, value: Any, default: Optional["QuestionCategory"] = None) -> "QuestionCategory":
+        """
+        Resolve a category from a member, name or value, ignoring case.
+        
+        Args:
+            value: QuestionCategory, or a string such as "SAFETY" or "Safety"
+            default: Member returned for unknown labels (raise if None)
+            
+        Returns:
+            Matching QuestionCategory member, or default
+            
+        Raises:
+            ValueError: If value does not name a category and no default is given
+        """
+        if isinstance(value, cls):
+            return value
+        member = _CATEGORY_LOOKUP.get(str(value).strip().lower())
+        if member is None:
+            if default is None:
+                raise ValueError(f"Unknown question category: {value!r}")
+            print(f"Unknown question category {value!r}, using {default.value}")
+            return default
+        return member
+
+
+# Lower-cased member names and values -> member, for QuestionCategory.parse
+_CATEGORY_LOOKUP: Dict[str, QuestionCategory] = {
+    key: member
+    for member in QuestionCategory
+    for key in (member.name.lower(), member.value.lower())
+}
 
 
 class Product(BaseModel):
-    """Schema for product information."""
+    """
+    Schema for product information.
+    
+    Frozen, so fields cannot be reassigned and the cached derived values
+    below never go stale. The list fields are still ordinary lists, so the
+    model is not hashable and those lists must not be modified in place.
+    """
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(..., description="Product name")
     concentration: str = Field(..., description="Product concentration")
     skin_type: List[str] = Field(..., description="Suitable skin types")
@@ -28,24 +73,112 @@ class Product(BaseModel):
     how_to_use: str = Field(..., description="Usage instructions")
     side_effects: str = Field(..., description="Potential side effects")
     price: str = Field(..., description="Product price")
+    
+    @field_validator("concentration", "price", mode="after")
+    @classmethod
+    def _intern_text(cls, value: str) -> str:
+        """Intern short values that repeat across a catalog (e.g. "10% Vitamin C")."""
+        return sys.intern(value)
+    
+    @field_validator("skin_type", "key_ingredients", mode="after")
+    @classmethod
+    def _intern_items(cls, values: List[str]) -> List[str]:
+        """Intern list entries so repeated skin types and ingredients share one string."""
+        return [sys.intern(value) for value in values]
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "Product":
+        """
+        Copy the product, dropping cached derived values.
+        
+        The copy shares the instance dict contents, so without this a copy
+        made with update= would keep the original's prompt_block and other
+        cached strings.
+        """
+        copied = super().model_copy(update=update, deep=deep)
+        for name, attr in type(self).__dict__.items():
+            if isinstance(attr, cached_property):
+                copied.__dict__.pop(name, None)
+        return copied
+    
+    @cached_property
+    def skin_type_str(self) -> str:
+        """Comma-separated skin types, joined once per product."""
+        return ', '.join(self.skin_type)
+    
+    @cached_property
+    def ingredients_str(self) -> str:
+        """Comma-separated key ingredients, joined once per product."""
+        return ', '.join(self.key_ingredients)
+    
+    @cached_property
+    def benefits_str(self) -> str:
+        """Comma-separated benefits, joined once per product."""
+        return ', '.join(self.benefits)
+    
+    @cached_property
+    def ingredients_set(self) -> FrozenSet[str]:
+        """Key ingredients as a frozenset, built once for set comparisons."""
+        return frozenset(self.key_ingredients)
+    
+    @cached_property
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Cached model_dump() of this product.
+        
+        Products are not modified after parsing, so the dump is computed once
+        and shared. Consumers that keep or hand out the data (such as
+        ComparisonTemplate.build) must copy it; use model_dump() for a copy
+        that is safe to modify.
+        """
+        return self.model_dump()
+    
+    @cached_property
+    def prompt_block(self) -> str:
+        """
+        Product data block shared by every LLM prompt.
+        
+        Built once per product and sent as the first message of each call, so
+        all prompts for a product share an identical, cacheable prefix.
+        """
+        return f"""Product Data:
+Name: {self.name}
+Concentration: {self.concentration}
+Skin Type: {self.skin_type_str}
+Ingredients: {self.ingredients_str}
+Benefits: {self.benefits_str}
+Usage: {self.how_to_use}
+Side Effects: {self.side_effects}
+Price: {self.price}"""
 
 
 class Question(BaseModel):
     """Schema for question items."""
+    model_config = ConfigDict(frozen=True)
+    
     id: str = Field(..., description="Question ID")
     text: str = Field(..., description="Question text")
-    category: str = Field(..., description="Question category (Informational, Safety, Usage, Purchase, Comparison)")
+    category: QuestionCategory = Field(..., description="Question category (Informational, Safety, Usage, Purchase, Comparison)")
     answer: Optional[str] = Field(default=None, description="Question answer")
+    
+    @field_validator("category", mode="before")
+    @classmethod
+    def _parse_category(cls, value: Any) -> QuestionCategory:
+        """Accept a category member, name or value in any case."""
+        return QuestionCategory.parse(value)
 
 
 class PageOutput(BaseModel):
     """Schema for page output."""
+    model_config = ConfigDict(frozen=True)
+    
     page_type: str = Field(..., description="Type of page")
     content: dict = Field(..., description="Page content")
 
 
 class FAQItem(BaseModel):
     """Schema for FAQ items."""
+    model_config = ConfigDict(frozen=True)
+    
     question: str = Field(..., description="The FAQ question")
     answer: str = Field(..., description="The FAQ answer")
 
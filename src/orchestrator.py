@@ -6,10 +6,21 @@ This module provides a high-level interface for the content generation pipeline.
 """
 
 import os
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 
-from src.graph.workflow import content_workflow
+from src.graph.workflow import get_workflow
 from src.graph.state import ContentGenerationState
+from src.config import BATCH_LLM_CALLS, BATCH_MAX_CONCURRENCY
+
+# Agent ID -> state key whose presence marks that agent as completed
+AGENT_STATE_KEYS: Dict[str, str] = {
+    "parser": "parsed_product",
+    "questions": "questions",
+    "faq": "faq_output",
+    "product": "product_output",
+    "comparison": "comparison_output",
+}
 
 
 class AgentOrchestrator:
@@ -21,13 +32,26 @@ class AgentOrchestrator:
     
     DAG Structure (managed by LangGraph):
     - parse_product (no deps) → runs first
-    - generate_questions, generate_product_page, generate_comparison_page (dep: parse_product)
+    - generate_questions, generate_product_page, generate_competitor_product (dep: parse_product)
     - generate_faq_page (deps: parse_product, generate_questions) → runs after questions
+    - generate_comparison_page (deps: parse_product, generate_competitor_product)
+    
+    Nodes in the same step run concurrently.
     """
     
-    def __init__(self):
-        """Initialize the orchestrator with LangGraph workflow."""
-        self.workflow = content_workflow
+    def __init__(self, batch_llm_calls: Optional[bool] = None):
+        """
+        Initialize the orchestrator with LangGraph workflow.
+        
+        The compiled graph is shared by every orchestrator using the same DAG
+        variant, so constructing one per product does not recompile it.
+        
+        Args:
+            batch_llm_calls: DAG variant to run (default: BATCH_LLM_CALLS setting)
+        """
+        if batch_llm_calls is None:
+            batch_llm_calls = BATCH_LLM_CALLS
+        self.workflow = get_workflow(batch_llm_calls)
         self._last_state: Dict[str, Any] = {}
     
     def execute_dag(self, raw_product_data: Dict) -> Dict[str, Any]:
@@ -56,6 +80,61 @@ class AgentOrchestrator:
         print("LangGraph workflow execution completed.")
         
         # Return dict with all page outputs (same interface as before)
+        return self._collect_outputs(final_state)
+    
+    def run_batch(self, products: List[Dict], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Execute the workflow for many products in one process.
+        
+        Up to max_concurrency products run at once on a thread pool, each as a
+        plain invoke() of the shared compiled graph. No run config is passed,
+        so every product keeps its own parallel DAG nodes. A product that
+        fails does not affect the others.
+        
+        Args:
+            products: List of raw product data dictionaries
+            max_concurrency: Maximum concurrent runs (default: BATCH_MAX_CONCURRENCY)
+            
+        Returns:
+            One output dictionary per product, in input order (same shape as
+            execute_dag plus an "error" key: None on success, otherwise the
+            exception that stopped that product's run). get_agent_status
+            reports on the last product.
+        """
+        if not products:
+            return []
+        
+        if max_concurrency is None:
+            max_concurrency = BATCH_MAX_CONCURRENCY
+        
+        print(f"Starting LangGraph batch execution for {len(products)} product(s)...")
+        
+        all_results = []
+        final_state: Dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(products)))) as pool:
+            futures = [
+                pool.submit(self.workflow.invoke, {"raw_input": raw_product_data})
+                for raw_product_data in products
+            ]
+            for future in futures:
+                try:
+                    final_state = future.result()
+                    error = None
+                except Exception as e:
+                    final_state = {}
+                    error = e
+                all_results.append({**self._collect_outputs(final_state), "error": error})
+        
+        self._last_state = final_state
+        
+        failed = sum(1 for result in all_results if result["error"] is not None)
+        print(f"LangGraph batch execution completed ({failed} failed).")
+        
+        return all_results
+    
+    @staticmethod
+    def _collect_outputs(final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the page outputs from a final workflow state."""
         return {
             "faq": final_state.get("faq_output"),
             "product": final_state.get("product_output"),
@@ -70,12 +149,10 @@ class AgentOrchestrator:
             Dictionary with agent statuses
         """
         # In LangGraph, if we have outputs, the nodes completed successfully
+        state = self._last_state
         return {
-            "parser": "completed" if self._last_state.get("parsed_product") else "pending",
-            "questions": "completed" if self._last_state.get("questions") else "pending",
-            "faq": "completed" if self._last_state.get("faq_output") else "pending",
-            "product": "completed" if self._last_state.get("product_output") else "pending",
-            "comparison": "completed" if self._last_state.get("comparison_output") else "pending"
+            agent_id: "completed" if state.get(key) else "pending"
+            for agent_id, key in AGENT_STATE_KEYS.items()
         }
     
     def reset(self):
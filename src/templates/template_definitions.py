@@ -4,8 +4,12 @@ Template Definitions Module
 Defines templates for various content types.
 """
 
+import copy
 from typing import Dict, Any, List
 
+# Keys every FAQ entry must carry
+_FAQ_FIELDS = frozenset(("question", "answer"))
+
 
 class FAQTemplate:
     """Template class for FAQ pages."""
@@ -26,16 +30,21 @@ class FAQTemplate:
         Raises:
             ValueError: If required fields are missing
         """
-        validated_faqs = []
-        for idx, q in enumerate(questions):
-            if "question" not in q:
-                raise ValueError(f"Question at index {idx} missing 'question' field")
-            if "answer" not in q:
-                raise ValueError(f"Question at index {idx} missing 'answer' field")
-            validated_faqs.append({
-                "question": str(q["question"]),
-                "answer": str(q["answer"])
-            })
+        # One subset test per entry; field-level detail only for the first failure
+        bad = next(
+            ((idx, q) for idx, q in enumerate(questions)
+             if not (isinstance(q, dict) and _FAQ_FIELDS <= q.keys())),
+            None
+        )
+        if bad is not None:
+            idx, q = bad
+            field = "answer" if isinstance(q, dict) and "question" in q else "question"
+            raise ValueError(f"Question at index {idx} missing '{field}' field")
+        
+        validated_faqs = [
+            {"question": str(q["question"]), "answer": str(q["answer"])}
+            for q in questions
+        ]
         
         return {
             "page_type": "faq",
@@ -118,7 +127,8 @@ class ComparisonTemplate:
         
         return {
             "page_type": "comparison",
-            "products": [dict(product_a), dict(product_b)],
+            # Deep copies: callers may pass shared dicts such as Product.as_dict
+            "products": [copy.deepcopy(product_a), copy.deepcopy(product_b)],
             "comparison_metrics": validated_metrics
         }
 
@@ -6,9 +6,68 @@ This module contains helper functions and utilities used across the content gene
 
 import json
 import os
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+import orjson
+
+
+def _serialize_output(data: Dict) -> bytes:
+    """
+    Serialize output data to formatted JSON bytes.
+    
+    Args:
+        data: Dictionary data to serialize (must be JSON-serializable)
+        
+    Returns:
+        UTF-8 encoded JSON with 2-space indentation
+        
+    Raises:
+        ValueError: If data is not JSON-serializable
+    """
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    except TypeError as e:
+        raise ValueError(f"Data is not JSON-serializable: {e}")
+
+
+def _write_atomic(filepath: str, payload: bytes) -> None:
+    """
+    Write bytes to filepath through a temporary file in the same directory.
+    
+    The finished file is moved into place with os.replace, so readers never
+    see a half-written file and a failed write leaves any previous version
+    intact.
+    
+    Args:
+        filepath: Destination path
+        payload: Complete file contents
+    """
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        # Payload is already complete, so skip the buffered writer and hand
+        # it to the kernel directly (os.write may accept only part of it)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+        try:
+            fd = os.open(tmp_path, flags, 0o666)
+        except FileNotFoundError:
+            # Directory removed between ensure_directory and this write
+            ensure_directory(os.path.dirname(filepath) or ".")
+            fd = os.open(tmp_path, flags, 0o666)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def write_json_output(data: Dict, filename: str, output_dir: str = "output/") -> None:
@@ -24,35 +83,68 @@ def write_json_output(data: Dict, filename: str, output_dir: str = "output/") ->
         ValueError: If data is not JSON-serializable
         IOError: If file cannot be written
     """
-    try:
-        # Validate data is JSON-serializable
-        json.dumps(data)
-    except (TypeError, ValueError) as e:
-        raise ValueError(f"Data is not JSON-serializable: {e}")
+    write_json_outputs([(data, filename)], output_dir)
+
+
+def write_json_outputs(items: List[Tuple[Dict, str]], output_dir: str = "output/") -> List[str]:
+    """
+    Write several JSON output files in one pass.
+    
+    Every payload is serialized before anything touches the disk, so a
+    non-serializable item leaves no partially written output set behind.
+    The output directory is created once for the whole batch.
+    
+    Args:
+        items: List of (data, filename) pairs to write
+        output_dir: Directory for output files (default: "output/")
+        
+    Returns:
+        List of written file paths, in input order
+        
+    Raises:
+        ValueError: If any data is not JSON-serializable
+        IOError: If a file cannot be written
+    """
+    # Serialize everything up front
+    payloads = [(filename, _serialize_output(data)) for data, filename in items]
     
+    written = []
+    filename = ""
     try:
         # Create output_dir if it doesn't exist
         ensure_directory(output_dir)
         
-        # Build full file path
-        filepath = os.path.join(output_dir, filename)
-        
-        # Write data to JSON file with proper formatting
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        for filename, payload in payloads:
+            filepath = os.path.join(output_dir, filename)
+            _write_atomic(filepath, payload)
+            written.append(filepath)
             
     except IOError as e:
-        raise IOError(f"Failed to write file {filename}: {e}")
+        raise IOError(f"Failed to write file {filename or output_dir}: {e}")
+    
+    return written
+
+
+# Absolute paths of directories already created by ensure_directory
+_ENSURED_DIRECTORIES = set()
 
 
 def ensure_directory(directory: str) -> None:
     """
     Create directory if it doesn't exist.
     
+    Directories this process already created are only checked with a cheap
+    isdir() instead of another mkdir, so one deleted since is created again.
+    
     Args:
         directory: Directory path to create
     """
-    Path(directory).mkdir(parents=True, exist_ok=True)
+    key = os.path.abspath(directory)
+    if key in _ENSURED_DIRECTORIES and os.path.isdir(key):
+        return
+    
+    Path(key).mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRECTORIES.add(key)
 
 
 def load_json(filepath: str) -> Dict[str, Any]:
@@ -65,8 +157,7 @@ def load_json(filepath: str) -> Dict[str, Any]:
     Returns:
         Parsed JSON data as a dictionary
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return orjson.loads(Path(filepath).read_bytes())
 
 
 def load_dataset(file_path: str) -> Dict[str, Any]:
@@ -107,6 +198,32 @@ def load_product_from_dataset(file_path: str, product_index: int = 0) -> Dict[st
         IndexError: If product_index is out of bounds
         KeyError: If dataset doesn't have 'products' key
     """
+    products = load_products_from_dataset(file_path)
+    
+    if product_index < 0 or product_index >= len(products):
+        raise IndexError(
+            f"Product index {product_index} out of bounds. "
+            f"Dataset has {len(products)} product(s)."
+        )
+    
+    return products[product_index]
+
+
+def load_products_from_dataset(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Load every product from a dataset.
+    
+    Args:
+        file_path: Path to dataset JSON file
+        
+    Returns:
+        List of product data dictionaries
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        KeyError: If dataset doesn't have 'products' key
+        ValueError: If the products list is empty
+    """
     dataset = load_dataset(file_path)
     
     if "products" not in dataset:
@@ -117,27 +234,75 @@ def load_product_from_dataset(file_path: str, product_index: int = 0) -> Dict[st
     if not products:
         raise ValueError("Dataset 'products' list is empty")
     
-    if product_index < 0 or product_index >= len(products):
-        raise IndexError(
-            f"Product index {product_index} out of bounds. "
-            f"Dataset has {len(products)} product(s)."
-        )
-    
-    return products[product_index]
+    return products
 
 
-def save_json(data: Dict[str, Any], filepath: str, indent: int = 2) -> None:
+def save_json(data: Dict[str, Any], filepath: str, indent: Optional[int] = 2) -> None:
     """
     Save data to a JSON file.
     
     Args:
         data: Data to save
         filepath: Path to the output file
-        indent: JSON indentation level
+        indent: JSON indentation level (None for compact output). orjson
+            handles 2 and None; other widths fall back to the stdlib encoder.
     """
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
+    if indent == 2:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    elif indent is None:
+        payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+    
+    ensure_directory(os.path.dirname(filepath) or ".")
+    _write_atomic(filepath, payload)
+
+
+def append_jsonl(record: Dict[str, Any], filepath: str) -> None:
+    """
+    Append one record to a JSON Lines file.
+    
+    Only the new record is encoded and written, so a growing dump never has
+    to be held in memory or rewritten.
+    
+    Args:
+        record: JSON-serializable record to append
+        filepath: Path to the .jsonl file (created if missing)
+        
+    Raises:
+        ValueError: If record is not JSON-serializable
+    """
+    try:
+        line = orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    except TypeError as e:
+        raise ValueError(f"Data is not JSON-serializable: {e}")
+    
+    ensure_directory(os.path.dirname(filepath) or ".")
+    # One write per record keeps lines from concurrent appenders whole
+    try:
+        f = open(filepath, 'ab')
+    except FileNotFoundError:
+        # Directory removed between ensure_directory and this write
+        ensure_directory(os.path.dirname(filepath) or ".")
+        f = open(filepath, 'ab')
+    with f:
+        f.write(line)
+
+
+def read_jsonl(filepath: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the records of a JSON Lines file.
+    
+    Args:
+        filepath: Path to the .jsonl file
+        
+    Yields:
+        Parsed records in file order (blank lines are skipped)
+    """
+    with open(filepath, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
 
 
 def generate_timestamp() -> str:
@@ -147,18 +312,24 @@ def generate_timestamp() -> str:
     Returns:
         Formatted timestamp string
     """
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    return _format_timestamp(int(time.time()))
+
+
+@lru_cache(maxsize=1)
+def _format_timestamp(second: int) -> str:
+    """Format a Unix second once; calls within the same second reuse it."""
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime(second))
 
 
-def validate_config(config: Dict[str, Any], required_keys: list) -> bool:
+def validate_config(config: Dict[str, Any], required_keys: Iterable[str]) -> bool:
     """
     Validate that a configuration dictionary contains required keys.
     
     Args:
         config: Configuration dictionary to validate
-        required_keys: List of required key names
+        required_keys: Required key names (any iterable, e.g. a frozenset)
         
     Returns:
         True if all required keys are present, False otherwise
     """
-    return all(key in config for key in required_keys)
+    return not set(required_keys).difference(config)
@@ -5,8 +5,35 @@ Validation functions for output quality and schema enforcement.
 Ensures hard requirements are met (e.g., FAQ count >= 15).
 """
 
-from typing import Dict, Any
+from typing import Any, Callable, Dict
 from src.config import MIN_FAQ_COUNT
+from src.models.schemas import Product
+
+# Product fields every downstream prompt depends on
+REQUIRED_PRODUCT_FIELDS = ("name", "key_ingredients", "benefits")
+
+# FAQ error templates; the minimum is fixed at import so only the
+# offending count or type is filled in when a check fails
+_FAQ_NOT_LIST_ERROR = "'faqs' must be a list, got %s"
+_FAQ_COUNT_ERROR = (
+    f"FAQ count (%d) is less than required minimum ({MIN_FAQ_COUNT}). "
+    f"Assignment requires at least {MIN_FAQ_COUNT} FAQs."
+)
+
+
+def validate_parsed_product(product: Product) -> None:
+    """
+    Validate parser output before any LLM-backed node runs.
+    
+    Args:
+        product: Product model produced by the parser
+        
+    Raises:
+        ValueError: If a required field is empty
+    """
+    missing = [field for field in REQUIRED_PRODUCT_FIELDS if not getattr(product, field)]
+    if missing:
+        raise ValueError(f"Parsed product missing required fields: {', '.join(missing)}")
 
 
 def validate_faq_count(faq_output: Dict[str, Any]) -> None:
@@ -19,22 +46,23 @@ def validate_faq_count(faq_output: Dict[str, Any]) -> None:
     Raises:
         ValueError: If FAQ count is less than MIN_FAQ_COUNT
     """
+    # Fast path: a single check covers the passing case
+    faqs = faq_output.get("faqs") if isinstance(faq_output, dict) else None
+    if isinstance(faqs, list) and len(faqs) >= MIN_FAQ_COUNT:
+        return
+    
+    # Slow path: work out which requirement failed for the error message
     if not faq_output:
         raise ValueError("FAQ output is None or empty")
     
     if "faqs" not in faq_output:
         raise ValueError("FAQ output missing 'faqs' key")
     
-    faqs = faq_output["faqs"]
     if not isinstance(faqs, list):
-        raise ValueError(f"'faqs' must be a list, got {type(faqs)}")
+        raise ValueError(_FAQ_NOT_LIST_ERROR % type(faqs).__name__)
     
-    faq_count = len(faqs)
-    if faq_count < MIN_FAQ_COUNT:
-        raise ValueError(
-            f"FAQ count ({faq_count}) is less than required minimum ({MIN_FAQ_COUNT}). "
-            f"Assignment requires at least {MIN_FAQ_COUNT} FAQs."
-        )
+    # Reaching here means the list is shorter than MIN_FAQ_COUNT
+    raise ValueError(_FAQ_COUNT_ERROR % len(faqs))
 
 
 def validate_output_schema(output: Dict[str, Any], schema_type: str) -> None:
@@ -60,17 +88,30 @@ def validate_output_schema(output: Dict[str, Any], schema_type: str) -> None:
         )
     
     # Schema-specific validations
-    if schema_type == "faq":
-        validate_faq_count(output)
-        
-    elif schema_type == "product":
-        if "sections" not in output:
-            raise ValueError("Product output missing 'sections' key")
-            
-    elif schema_type == "comparison":
-        if "products" not in output:
-            raise ValueError("Comparison output missing 'products' key")
-        if len(output["products"]) != 2:
-            raise ValueError(
-                f"Comparison must have exactly 2 products, got {len(output['products'])}"
-            )
+    schema_validator = _SCHEMA_VALIDATORS.get(schema_type)
+    if schema_validator is not None:
+        schema_validator(output)
+
+
+def _validate_product_output(output: Dict[str, Any]) -> None:
+    """Check product page specific structure."""
+    if "sections" not in output:
+        raise ValueError("Product output missing 'sections' key")
+
+
+def _validate_comparison_output(output: Dict[str, Any]) -> None:
+    """Check comparison page specific structure."""
+    if "products" not in output:
+        raise ValueError("Comparison output missing 'products' key")
+    if len(output["products"]) != 2:
+        raise ValueError(
+            f"Comparison must have exactly 2 products, got {len(output['products'])}"
+        )
+
+
+# Page type -> structure validator used by validate_output_schema
+_SCHEMA_VALIDATORS: Dict[str, Callable[[Dict[str, Any]], None]] = {
+    "faq": validate_faq_count,
+    "product": _validate_product_output,
+    "comparison": _validate_comparison_output,
+}
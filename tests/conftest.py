@@ -5,6 +5,7 @@ Provides mocked LLM client and test data fixtures.
 """
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from typing import Dict, Any
 
@@ -12,23 +13,22 @@ from typing import Dict, Any
 @pytest.fixture
 def mock_llm_client():
     """Provide a mocked LLM client for tests."""
-    mock = MagicMock()
-    
-    # Default JSON response for generate_json
-    mock.generate_json.return_value = [
-        {"id": "q1", "text": "Sample question 1?", "category": "INFORMATIONAL"},
-        {"id": "q2", "text": "Sample question 2?", "category": "SAFETY"}
-    ]
-    
-    # Default text response for generate
-    mock.generate.return_value = "Sample response"
-    
-    return mock
-
-
-@pytest.fixture
+    # Only the two client methods need call tracking; a plain namespace
+    # avoids MagicMock's auto-created child mocks for everything else
+    return SimpleNamespace(
+        # Default JSON response for generate_json
+        generate_json=MagicMock(return_value=[
+            {"id": "q1", "text": "Sample question 1?", "category": "INFORMATIONAL"},
+            {"id": "q2", "text": "Sample question 2?", "category": "SAFETY"}
+        ]),
+        # Default text response for generate
+        generate=MagicMock(return_value="Sample response"),
+    )
+
+
+@pytest.fixture(scope="session")
 def sample_product_data():
-    """Provide sample product data for tests (not hardcoded in code)."""
+    """Provide sample product data for tests (shared per session; copy before mutating)."""
     return {
         "name": "Test Vitamin C Serum",
         "concentration": "10% Vitamin C",
@@ -41,9 +41,9 @@ def sample_product_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_faq_response():
-    """Provide mock FAQ response with 15+ questions."""
+    """Provide mock FAQ response with 15+ questions (shared, read-only)."""
     return [
         {"question": f"Question {i}?", "answer": f"Answer {i}."}
         for i in range(1, 16)
@@ -36,7 +36,7 @@ class TestDataParserAgent:
         """Test that parser agent initializes with correct ID and no dependencies."""
         agent = DataParserAgent()
         assert agent.agent_id == "parser"
-        assert agent.dependencies == []
+        assert agent.dependencies == frozenset()
         assert agent.status == "pending"
     
     def test_can_execute_always_true(self):
@@ -86,7 +86,7 @@ class TestQuestionGenerationAgent:
         """Test that question agent initializes correctly."""
         agent = QuestionGenerationAgent()
         assert agent.agent_id == "questions"
-        assert agent.dependencies == ["parser"]
+        assert agent.dependencies == frozenset({"parser"})
         assert agent.status == "pending"
     
     def test_can_execute_requires_parser(self):
@@ -105,7 +105,7 @@ class TestFAQGenerationAgent:
         """Test that FAQ agent initializes correctly."""
         agent = FAQGenerationAgent()
         assert agent.agent_id == "faq"
-        assert agent.dependencies == ["parser", "questions"]
+        assert agent.dependencies == frozenset({"parser", "questions"})
         assert agent.status == "pending"
     
     def test_can_execute_requires_both_dependencies(self):
@@ -124,7 +124,7 @@ class TestProductPageAgent:
         """Test that product agent initializes correctly."""
         agent = ProductPageAgent()
         assert agent.agent_id == "product"
-        assert agent.dependencies == ["parser"]
+        assert agent.dependencies == frozenset({"parser"})
         assert agent.status == "pending"
     
     def test_can_execute_requires_parser(self):
@@ -141,7 +141,7 @@ class TestComparisonAgent:
         """Test that comparison agent initializes correctly."""
         agent = ComparisonAgent()
         assert agent.agent_id == "comparison"
-        assert agent.dependencies == ["parser"]
+        assert agent.dependencies == frozenset({"parser"})
         assert agent.status == "pending"
     
     def test_can_execute_requires_parser(self):
@@ -191,3 +191,10 @@ class TestAgentDependencyChain:
         completed = ["parser", "questions"]
         
         assert faq.can_execute(completed) is True
+    
+    def test_can_execute_accepts_set_of_completed_ids(self):
+        """Test that a set of completed agent IDs works as well as a list."""
+        faq = FAQGenerationAgent()
+        
+        assert faq.can_execute({"parser", "questions"}) is True
+        assert faq.can_execute({"parser"}) is False
@@ -112,6 +112,12 @@ class TestCalculatePriceDifference:
         
         # Difference is 50, percentage is 50/100 * 100 = 50%
         assert "50" in result["percentage"]
+    
+    def test_prices_with_surrounding_text(self):
+        """Test that prices not in the plain ₹<digits> form still parse."""
+        result = calculate_price_difference("Rs. 699 only", "₹ 899")
+        
+        assert result["difference"] == "₹200"
 
 
 class TestExtractCommonIngredients:
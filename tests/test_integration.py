@@ -11,7 +11,7 @@ from unittest.mock import patch, MagicMock
 
 from src.orchestrator import AgentOrchestrator
 from src.templates.template_definitions import FAQTemplate, ProductTemplate, ComparisonTemplate
-from src.models.schemas import Product, Question
+from src.models.schemas import Product, Question, QuestionCategory
 
 
 class TestTemplates:
@@ -41,6 +41,27 @@ class TestTemplates:
         
         assert "missing 'answer' field" in str(excinfo.value)
     
+    def test_faq_template_reports_first_bad_index(self):
+        """Test FAQTemplate names the first incomplete entry and its missing field."""
+        questions = [
+            {"question": "Q1?", "answer": "A1."},
+            {"answer": "A2."},
+            {"question": "Q3?"},
+        ]
+        
+        with pytest.raises(ValueError, match="index 1 missing 'question' field"):
+            FAQTemplate.build(questions)
+    
+    def test_faq_template_rejects_non_dict_entries(self):
+        """Test FAQTemplate raises ValueError (not AttributeError) for malformed entries."""
+        with pytest.raises(ValueError, match="index 0 missing 'question' field"):
+            FAQTemplate.build(["What is this question?", "Another?"])
+        
+        # The LLM returned the wrapper object instead of the list
+        wrapped = {"faqs": [{"question": "Q?", "answer": "A."}]}
+        with pytest.raises(ValueError, match="index 0 missing 'question' field"):
+            FAQTemplate.build(wrapped)
+    
     def test_product_template_build(self):
         """Test ProductTemplate builds valid output."""
         product_data = {
@@ -96,6 +117,16 @@ class TestOrchestratorInitialization:
         assert orchestrator.workflow is not None
         assert orchestrator._last_state == {}
     
+    def test_orchestrators_share_compiled_workflow(self):
+        """Test that the compiled graph is reused per DAG variant."""
+        first = AgentOrchestrator(batch_llm_calls=False)
+        second = AgentOrchestrator(batch_llm_calls=False)
+        batched = AgentOrchestrator(batch_llm_calls=True)
+        
+        assert first.workflow is second.workflow
+        assert batched.workflow is not first.workflow
+        assert "generate_parser_dependents" in batched.workflow.get_graph().nodes
+    
     def test_orchestrator_reset(self):
         """Test that reset clears last state."""
         orchestrator = AgentOrchestrator()
@@ -164,6 +195,68 @@ class TestSchemaValidation:
         assert isinstance(data, dict)
         assert data["name"] == "Test Vitamin C Serum"
     
+    def test_product_is_immutable(self, sample_product_data):
+        """Test that Product fields cannot be reassigned after parsing."""
+        from pydantic import ValidationError
+        
+        product = Product(**sample_product_data)
+        
+        with pytest.raises(ValidationError):
+            product.name = "Changed"
+        
+        product.prompt_block  # populate the cache before copying
+        changed = product.model_copy(update={"name": "Changed"})
+        assert changed.name == "Changed"
+        assert "Name: Changed" in changed.prompt_block
+    
+    def test_product_interns_repeated_values(self, sample_product_data):
+        """Test that equal field values from separate inputs share one string."""
+        first = Product(**dict(sample_product_data, price="".join(["₹", "699"])))
+        second = Product(**dict(sample_product_data, price="".join(["₹", "6", "99"]),
+                                key_ingredients=["".join(["Vitamin", " C"])]))
+        
+        assert first.price is second.price
+        assert first.key_ingredients[0] is second.key_ingredients[0]
+    
+    def test_product_as_dict_is_cached_dump(self, sample_product_data):
+        """Test Product.as_dict matches model_dump and is computed once."""
+        product = Product(**sample_product_data)
+        
+        assert product.as_dict == product.model_dump()
+        assert product.as_dict is product.as_dict
+        assert "as_dict" not in product.model_dump()
+    
+    def test_comparison_page_does_not_share_product_lists(self, sample_product_data):
+        """Test that editing a comparison page leaves the cached product dump untouched."""
+        product = Product(**sample_product_data)
+        page = ComparisonTemplate.build(product.as_dict, product.as_dict, [])
+        
+        page["products"][0]["key_ingredients"].append("Niacinamide")
+        
+        assert product.as_dict["key_ingredients"] == ["Vitamin C", "Hyaluronic Acid"]
+    
+    def test_product_joined_field_strings(self, sample_product_data):
+        """Test the cached comma-joined list fields."""
+        product = Product(**sample_product_data)
+        
+        assert product.skin_type_str == "Oily, Combination"
+        assert product.ingredients_str == "Vitamin C, Hyaluronic Acid"
+        assert product.benefits_str == "Brightening, Fades dark spots"
+        assert product.benefits_str is product.benefits_str
+    
+    def test_product_prompt_block(self, sample_product_data):
+        """Test Product.prompt_block lists every field and is built once."""
+        product = Product(**sample_product_data)
+        
+        block = product.prompt_block
+        
+        assert block.startswith("Product Data:")
+        assert "Name: Test Vitamin C Serum" in block
+        assert "Ingredients: Vitamin C, Hyaluronic Acid" in block
+        assert "Price: ₹699" in block
+        assert product.prompt_block is block
+        assert "prompt_block" not in product.model_dump()
+    
     def test_question_schema_valid(self):
         """Test Question schema with valid data."""
         question = Question(
@@ -174,7 +267,28 @@ class TestSchemaValidation:
         
         assert question.id == "q1"
         assert question.text == "What does this product do?"
+        assert question.category is QuestionCategory.INFORMATIONAL
         assert question.answer is None  # Optional field
+    
+    def test_question_category_accepts_names_and_values(self):
+        """Test that categories parse from enum names or values in any case."""
+        for label in ("SAFETY", "safety", "Safety", " SAFETY ", QuestionCategory.SAFETY):
+            assert Question(id="q", text="?", category=label).category is QuestionCategory.SAFETY
+        
+        with pytest.raises(ValueError):
+            Question(id="q", text="?", category="Pricing")
+    
+    def test_question_category_unknown_label_falls_back(self):
+        """Test that an unexpected LLM label maps to GENERAL instead of failing."""
+        from src.graph.workflow import _questions_from_response
+        
+        questions = _questions_from_response([
+            {"id": "q1", "text": "Which actives?", "category": "Ingredients"},
+            {"id": "q2", "text": "Is it safe?", "category": "SAFETY"},
+        ])
+        
+        assert [q.category for q in questions] == [QuestionCategory.GENERAL, QuestionCategory.SAFETY]
+        assert QuestionCategory.parse("Results", default=QuestionCategory.GENERAL) is QuestionCategory.GENERAL
 
 
 class TestMockedWorkflowExecution:
@@ -192,6 +306,19 @@ class TestMockedWorkflowExecution:
         assert isinstance(result["parsed_product"], Product)
         assert result["parsed_product"].name == "Test Vitamin C Serum"
     
+    @patch('src.graph.workflow.get_llm_client')
+    def test_invalid_product_stops_before_llm_nodes(self, mock_get_llm, sample_product_data):
+        """Test that incomplete product data fails in the parser without any LLM call."""
+        from src.graph.workflow import create_workflow
+        
+        bad_data = dict(sample_product_data, name="", key_ingredients=[])
+        
+        with pytest.raises(ValueError) as excinfo:
+            create_workflow().invoke({"raw_input": bad_data})
+        
+        assert "name, key_ingredients" in str(excinfo.value)
+        mock_get_llm.assert_not_called()
+    
     @patch('src.graph.workflow.get_llm_client')
     @patch('src.graph.workflow._delay_for_rate_limit')
     def test_generate_questions_node(self, mock_delay, mock_get_llm, sample_product_data, mock_llm_client):
@@ -214,6 +341,16 @@ class TestMockedWorkflowExecution:
         assert len(result["questions"]) == 2
         mock_llm_client.generate_json.assert_called_once()
     
+    def test_questions_from_response_coerces_fields(self):
+        """Test that unvalidated Question construction still yields string fields."""
+        from src.graph.workflow import _questions_from_response
+        
+        questions = _questions_from_response([{"id": 1, "text": "Is it safe?", "category": "SAFETY"}])
+        
+        assert questions[0].model_dump() == {
+            "id": "1", "text": "Is it safe?", "category": QuestionCategory.SAFETY, "answer": None
+        }
+    
     @patch('src.graph.workflow.get_llm_client')
     @patch('src.graph.workflow._delay_for_rate_limit')
     def test_generate_faq_node(self, mock_delay, mock_get_llm, sample_product_data, mock_faq_response):
@@ -237,6 +374,138 @@ class TestMockedWorkflowExecution:
         
         assert "faq_output" in result
         assert result["faq_output"]["page_type"] == "faq"
+    
+    @patch('src.graph.workflow.get_llm_client')
+    @patch('src.graph.workflow._delay_for_rate_limit')
+    def test_generate_comparison_node_uses_competitor(self, mock_delay, mock_get_llm, sample_product_data, mock_llm_client):
+        """Test generate_comparison_page reads the competitor from state."""
+        from src.graph.workflow import generate_comparison_page
+        
+        mock_get_llm.return_value = mock_llm_client
+        mock_llm_client.generate_json.return_value = {"recommendation": "Either works."}
+        
+        product_a = Product(**sample_product_data)
+        product_b = Product(**{**sample_product_data, "name": "Rival Serum", "price": "₹899"})
+        state = {"parsed_product": product_a, "competitor_product": product_b}
+        
+        result = generate_comparison_page(state)
+        
+        output = result["comparison_output"]
+        assert output["page_type"] == "comparison"
+        assert output["products"][1]["name"] == "Rival Serum"
+        mock_llm_client.generate_json.assert_called_once()
+
+
+class TestMockedPipelineExecution:
+    """Tests for the full DAG run through the orchestrator with mocked LLM."""
+    
+    @staticmethod
+    def _fake_generate_json(system_prompt, user_prompt, max_tokens=2000, **kwargs):
+        """Return a canned response matching the node that issued the prompt."""
+        if "Generate EXACTLY 15 user questions" in user_prompt:
+            return [
+                {"id": f"q{i}", "text": f"Question {i}?", "category": "INFORMATIONAL"}
+                for i in range(1, 16)
+            ]
+        if "Generate FAQ answers" in user_prompt:
+            return [
+                {"question": f"Question {i}?", "answer": f"Answer {i}."}
+                for i in range(1, 16)
+            ]
+        if "Create product page content" in user_prompt:
+            return {"description": "A test description."}
+        if "Create a fictional competitor" in user_prompt:
+            return {"name": "Rival Serum", "price": "₹899"}
+        return {"recommendation": "Either works."}
+    
+    @patch('src.graph.workflow.get_llm_client')
+    @patch('src.graph.workflow._delay_for_rate_limit')
+    def test_execute_dag_produces_all_pages(self, mock_delay, mock_get_llm, sample_product_data):
+        """Test that execute_dag runs every node and returns all three pages."""
+        mock_llm = MagicMock()
+        mock_llm.generate_json.side_effect = self._fake_generate_json
+        mock_get_llm.return_value = mock_llm
+        
+        orchestrator = AgentOrchestrator(batch_llm_calls=False)
+        results = orchestrator.execute_dag(sample_product_data)
+        
+        assert results["faq"]["page_type"] == "faq"
+        assert len(results["faq"]["faqs"]) == 15
+        assert results["product"]["page_type"] == "product"
+        assert results["comparison"]["products"][1]["name"] == "Rival Serum"
+        assert mock_llm.generate_json.call_count == 5
+        assert set(orchestrator.get_agent_status().values()) == {"completed"}
+    
+    @patch('src.graph.workflow.get_llm_client')
+    @patch('src.graph.workflow._delay_for_rate_limit')
+    def test_run_batch_returns_pages_per_product(self, mock_delay, mock_get_llm, sample_product_data):
+        """Test that run_batch runs one pipeline per product, in input order."""
+        mock_llm = MagicMock()
+        mock_llm.generate_json.side_effect = self._fake_generate_json
+        mock_get_llm.return_value = mock_llm
+        
+        products = [
+            sample_product_data,
+            dict(sample_product_data, name="Second Serum"),
+        ]
+        
+        orchestrator = AgentOrchestrator(batch_llm_calls=False)
+        all_results = orchestrator.run_batch(products, max_concurrency=2)
+        
+        assert len(all_results) == 2
+        assert [r["comparison"]["products"][0]["name"] for r in all_results] == [
+            "Test Vitamin C Serum", "Second Serum"
+        ]
+        assert all(len(r["faq"]["faqs"]) == 15 for r in all_results)
+        assert mock_llm.generate_json.call_count == 10
+        assert [r["error"] for r in all_results] == [None, None]
+        assert orchestrator.run_batch([]) == []
+    
+    @patch('src.graph.workflow.get_llm_client')
+    @patch('src.graph.workflow._delay_for_rate_limit')
+    def test_run_batch_keeps_results_when_one_product_fails(self, mock_delay, mock_get_llm, sample_product_data):
+        """Test that a failing product is reported without dropping the others."""
+        mock_llm = MagicMock()
+        mock_llm.generate_json.side_effect = self._fake_generate_json
+        mock_get_llm.return_value = mock_llm
+        
+        products = [
+            sample_product_data,
+            dict(sample_product_data, name="", key_ingredients=[]),
+            dict(sample_product_data, name="Third Serum"),
+        ]
+        
+        orchestrator = AgentOrchestrator(batch_llm_calls=False)
+        all_results = orchestrator.run_batch(products, max_concurrency=2)
+        
+        assert len(all_results) == 3
+        assert isinstance(all_results[1]["error"], ValueError)
+        assert all_results[1]["faq"] is None
+        assert all_results[0]["error"] is None and all_results[2]["error"] is None
+        assert all_results[2]["comparison"]["products"][0]["name"] == "Third Serum"
+        assert len(all_results[0]["faq"]["faqs"]) == 15
+    
+    @patch('src.graph.workflow.get_llm_client')
+    @patch('src.graph.workflow._delay_for_rate_limit')
+    def test_batched_workflow_produces_all_pages(self, mock_delay, mock_get_llm, sample_product_data):
+        """Test that the batched graph makes one call for the parser dependents."""
+        from src.graph.workflow import create_workflow
+        
+        mock_llm = MagicMock()
+        mock_llm.generate_json.side_effect = self._fake_generate_json
+        mock_llm.generate_json_batch.side_effect = lambda requests, context=None: [
+            self._fake_generate_json(*request) for request in requests
+        ]
+        mock_get_llm.return_value = mock_llm
+        
+        final_state = create_workflow(batch_llm_calls=True).invoke({"raw_input": sample_product_data})
+        
+        mock_llm.generate_json_batch.assert_called_once()
+        assert len(mock_llm.generate_json_batch.call_args.args[0]) == 3
+        assert mock_llm.generate_json.call_count == 2  # FAQ + comparison
+        assert len(final_state["faq_output"]["faqs"]) == 15
+        assert final_state["product_output"]["page_type"] == "product"
+        assert final_state["comparison_output"]["products"][1]["name"] == "Rival Serum"
 
 
 class TestOutputStructure:
@@ -313,3 +582,23 @@ class TestOutputValidation:
             validate_output_schema({"page_type": "product"}, "faq")
         
         assert "Expected page_type 'faq'" in str(excinfo.value)
+    
+    def test_output_schema_page_specific_checks(self):
+        """Test that product and comparison pages get their structure checks."""
+        from src.validators import validate_output_schema
+        import pytest
+        
+        validate_output_schema({"page_type": "product", "sections": {}}, "product")
+        with pytest.raises(ValueError, match="missing 'sections'"):
+            validate_output_schema({"page_type": "product"}, "product")
+        
+        with pytest.raises(ValueError, match="exactly 2 products"):
+            validate_output_schema({"page_type": "comparison", "products": [{}]}, "comparison")
+    
+    def test_faq_count_rejects_non_dict_output(self):
+        """Test that a non-dict FAQ output raises ValueError, not AttributeError."""
+        from src.validators import validate_faq_count
+        import pytest
+        
+        with pytest.raises(ValueError, match="missing 'faqs' key"):
+            validate_faq_count([{"question": "Q?", "answer": "A."}] * 15)
@@ -0,0 +1,323 @@
+"""
+Tests for LLM Client
+
+Unit tests for LLMClient helpers. The Groq client is never constructed;
+generate/generate_json are stubbed so no API key or network is needed.
+"""
+
+import time
+import pytest
+from unittest.mock import MagicMock
+
+import orjson
+
+from src.llm_client import LLMClient, ResponseCache, _extract_json_span, _parse_json_response
+
+
+@pytest.fixture
+def client() -> LLMClient:
+    """Create an LLMClient without running __init__ (no API key needed)."""
+    return LLMClient.__new__(LLMClient)
+
+
+class TestGenerate:
+    """Tests for LLMClient.generate message layout."""
+    
+    @staticmethod
+    def _sent_messages(client):
+        """Return the messages passed to the stubbed Groq client."""
+        return client.client.chat.completions.create.call_args.kwargs["messages"]
+    
+    def test_context_is_first_message(self, client):
+        """Test that shared context leads the messages so prompts share a prefix."""
+        client.client = MagicMock()
+        client.model = "test-model"
+        
+        client.generate("Task system", "Task user", context="Product Data: X")
+        
+        messages = self._sent_messages(client)
+        assert [m["content"] for m in messages] == ["Product Data: X", "Task system", "Task user"]
+        assert messages[0]["role"] == "system"
+    
+    def test_no_context_message_by_default(self, client):
+        """Test that only the task prompts are sent without context."""
+        client.client = MagicMock()
+        client.model = "test-model"
+        
+        client.generate("Task system", "Task user")
+        
+        assert len(self._sent_messages(client)) == 2
+    
+    def test_temperature_is_forwarded(self, client):
+        """Test that the sampling temperature reaches the provider call."""
+        client.client = MagicMock()
+        client.model = "test-model"
+        
+        client.generate("Task system", "Task user", temperature=0.0)
+        
+        assert client.client.chat.completions.create.call_args.kwargs["temperature"] == 0.0
+
+
+class TestParseJsonResponse:
+    """Tests for JSON extraction from raw LLM replies."""
+    
+    def test_plain_json(self):
+        """Test that well-formed JSON parses directly."""
+        assert _parse_json_response('{"name": "Serum"}') == {"name": "Serum"}
+    
+    def test_markdown_fences_are_removed(self):
+        """Test that a fenced code block is unwrapped."""
+        assert _parse_json_response('```json\n[1, 2]\n```') == [1, 2]
+    
+    def test_surrounding_prose_is_cut(self):
+        """Test that text before and after the JSON is ignored."""
+        assert _parse_json_response('Sure! {"a": 1} Hope this helps.') == {"a": 1}
+    
+    def test_raw_newlines_in_strings_are_escaped(self):
+        """Test that unescaped newlines inside strings are repaired."""
+        assert _parse_json_response('{"a": "line1\nline2"}') == {"a": "line1\nline2"}
+    
+    def test_invalid_json_raises(self):
+        """Test that unrecoverable text raises a decode error."""
+        with pytest.raises(orjson.JSONDecodeError):
+            _parse_json_response("not json at all")
+
+
+class TestExtractJsonSpan:
+    """Tests for the bracket-matching JSON span scanner."""
+    
+    def test_trailing_prose_with_brackets_is_dropped(self):
+        """Test that brackets after the JSON do not extend the span."""
+        assert _extract_json_span('Result: {"a": [1]} (see [note])') == '{"a": [1]}'
+    
+    def test_brackets_inside_strings_are_ignored(self):
+        """Test that brackets and escaped quotes in strings do not change depth."""
+        text = '{"a": "x } \\" ]"} tail'
+        
+        assert _extract_json_span(text) == '{"a": "x } \\" ]"}'
+    
+    def test_array_before_object(self):
+        """Test that the earliest opening bracket starts the span."""
+        assert _extract_json_span('[{"a": 1}, {"b": 2}]') == '[{"a": 1}, {"b": 2}]'
+    
+    def test_unclosed_and_missing_brackets(self):
+        """Test the fallbacks for truncated replies and plain text."""
+        assert _extract_json_span('x {"a": [1') == '{"a": [1'
+        assert _extract_json_span("no json") == "no json"
+
+
+class TestGenerateJsonBatch:
+    """Tests for LLMClient.generate_json_batch."""
+    
+    def test_single_call_for_all_requests(self, client):
+        """Test that all prompts are sent in one call and results keep their order."""
+        client.generate_json = MagicMock(return_value=[{"a": 1}, [2], {"c": 3}])
+        requests = [
+            ("System A", "Prompt A", 100),
+            ("System B", "Prompt B", 200),
+            ("System C", "Prompt C", 300)
+        ]
+        
+        results = client.generate_json_batch(requests)
+        
+        assert results == [{"a": 1}, [2], {"c": 3}]
+        client.generate_json.assert_called_once()
+        _, user_prompt, max_tokens, _, _ = client.generate_json.call_args.args
+        assert "=== TASK 1 ===" in user_prompt and "Prompt C" in user_prompt
+        assert max_tokens == 600
+    
+    def test_falls_back_on_result_count_mismatch(self, client):
+        """Test one call per prompt when the batched response is incomplete."""
+        replies = {"Prompt A": {"a": 1}, "Prompt B": {"b": 2}}
+        client.generate_json = MagicMock(
+            side_effect=lambda system, user, *args: replies.get(user, [{"a": 1}])
+        )
+        requests = [("System A", "Prompt A", 100), ("System B", "Prompt B", 200)]
+        
+        results = client.generate_json_batch(requests)
+        
+        assert results == [{"a": 1}, {"b": 2}]
+        assert client.generate_json.call_count == 3
+    
+    def test_single_request_is_not_wrapped(self, client):
+        """Test that a single prompt is sent as-is."""
+        client.generate_json = MagicMock(return_value={"a": 1})
+        
+        results = client.generate_json_batch([("System", "Prompt", 100)])
+        
+        assert results == [{"a": 1}]
+        client.generate_json.assert_called_once_with("System", "Prompt", 100, 3, None)
+    
+    def test_context_is_sent_once(self, client):
+        """Test that shared context is passed to the single batched call."""
+        client.generate_json = MagicMock(return_value=[{"a": 1}, {"b": 2}])
+        requests = [("System A", "Prompt A", 100), ("System B", "Prompt B", 200)]
+        
+        client.generate_json_batch(requests, context="Product Data: X")
+        
+        args = client.generate_json.call_args.args
+        assert args[4] == "Product Data: X"
+        assert "Product Data: X" not in args[1]
+
+
+class TestGenerateMany:
+    """Tests for concurrent dispatch in LLMClient.generate_many/generate_json_many."""
+    
+    def test_results_keep_request_order(self, client):
+        """Test that results line up with requests even when calls finish out of order."""
+        def slow_generate(system, user, max_tokens, max_retries, context=None):
+            time.sleep(0.05 if user == "first" else 0)
+            return user.upper()
+        
+        client.generate = MagicMock(side_effect=slow_generate)
+        
+        results = client.generate_many([("S", "first", 10), ("S", "second", 10)], context="ctx")
+        
+        assert results == ["FIRST", "SECOND"]
+        assert all(c.kwargs["context"] == "ctx" for c in client.generate.call_args_list)
+    
+    def test_json_many_calls_generate_json_per_request(self, client):
+        """Test that each request gets its own generate_json call."""
+        client.generate_json = MagicMock(side_effect=lambda s, u, *args: {"prompt": u})
+        
+        results = client.generate_json_many([("S", "a", 10), ("S", "b", 10), ("S", "c", 10)])
+        
+        assert results == [{"prompt": "a"}, {"prompt": "b"}, {"prompt": "c"}]
+        assert client.generate_json.call_count == 3
+    
+    def test_empty_requests(self, client):
+        """Test that no requests means no calls."""
+        assert client.generate_many([]) == []
+
+
+class TestResponseCache:
+    """Tests for the two-level LLM response cache."""
+    
+    def test_miss_returns_none(self, tmp_path):
+        """Test that an unknown key is a miss."""
+        cache = ResponseCache(str(tmp_path))
+        
+        assert cache.get("missing") is None
+    
+    def test_entries_persist_on_disk(self, tmp_path):
+        """Test that a new cache instance reads entries written by another."""
+        ResponseCache(str(tmp_path)).set("key", '{"a": 1}')
+        
+        assert ResponseCache(str(tmp_path)).get("key") == '{"a": 1}'
+    
+    def test_memory_lru_evicts_oldest(self):
+        """Test that the in-memory LRU keeps at most max_memory_items entries."""
+        cache = ResponseCache(cache_dir=None, max_memory_items=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")  # 'a' is now most recently used
+        cache.set("c", "3")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+    
+    def test_key_depends_on_every_part(self):
+        """Test that changing any request part changes the key."""
+        base = ResponseCache.make_key("model", "ctx", "sys", "user", 100)
+        
+        assert base == ResponseCache.make_key("model", "ctx", "sys", "user", 100)
+        assert base != ResponseCache.make_key("model", "ctx", "sys", "user", 200)
+        assert base != ResponseCache.make_key("model", "", "sys", "user", 100)
+
+
+class TestGenerateCache:
+    """Tests for raw-text response caching in LLMClient.generate."""
+    
+    @pytest.fixture
+    def cached_client(self, client, tmp_path):
+        """Client with a disk cache and a stubbed Groq client."""
+        client.model = "test-model"
+        client.cache = ResponseCache(str(tmp_path))
+        client.client = MagicMock()
+        client.client.chat.completions.create.return_value.choices[0].message.content = "Hello"
+        return client
+    
+    def test_repeat_request_skips_api(self, cached_client):
+        """Test that an identical prompt is answered from the cache."""
+        assert cached_client.generate("System", "Prompt", temperature=0.0) == "Hello"
+        assert cached_client.generate("System", "Prompt", temperature=0.0) == "Hello"
+        
+        cached_client.client.chat.completions.create.assert_called_once()
+    
+    def test_sampled_requests_are_not_cached(self, cached_client):
+        """Test that non-zero temperature calls always get a fresh sample."""
+        cached_client.generate("System", "Prompt", temperature=0.7)
+        cached_client.generate("System", "Prompt", temperature=0.7)
+        cached_client.generate("System", "Prompt")
+        
+        assert cached_client.client.chat.completions.create.call_count == 3
+        assert not list(cached_client.cache.cache_dir.glob("*.json"))
+    
+    def test_use_cache_false_calls_api(self, cached_client):
+        """Test that use_cache=False always calls the provider."""
+        cached_client.generate("System", "Prompt", temperature=0.0)
+        cached_client.generate("System", "Prompt", temperature=0.0, use_cache=False)
+        
+        assert cached_client.client.chat.completions.create.call_count == 2
+
+
+class TestGenerateJsonCache:
+    """Tests for response caching in LLMClient.generate_json."""
+    
+    @pytest.fixture
+    def cached_client(self, client, tmp_path):
+        """Client with a disk cache and a stubbed generate."""
+        client.model = "test-model"
+        client.cache = ResponseCache(str(tmp_path))
+        client.generate = MagicMock(return_value='{"name": "Serum"}')
+        return client
+    
+    def test_repeat_request_skips_llm(self, cached_client):
+        """Test that an identical request is served from the cache."""
+        first = cached_client.generate_json("System", "Prompt", 100)
+        second = cached_client.generate_json("System", "Prompt", 100)
+        
+        assert first == second == {"name": "Serum"}
+        cached_client.generate.assert_called_once()
+    
+    def test_cached_result_is_not_shared(self, cached_client):
+        """Test that mutating a returned result does not change the cache."""
+        cached_client.generate_json("System", "Prompt", 100).setdefault("price", "₹1")
+        
+        assert cached_client.generate_json("System", "Prompt", 100) == {"name": "Serum"}
+    
+    def test_corrupt_entry_is_refetched(self, cached_client, tmp_path):
+        """Test that an unreadable cache file falls back to the provider and is replaced."""
+        cached_client.generate_json("System", "Prompt", 100)
+        (entry,) = tmp_path.glob("*.json")
+        entry.write_text('{"name": "Ser', encoding="utf-8")
+        cached_client.cache = ResponseCache(str(tmp_path))
+        
+        assert cached_client.generate_json("System", "Prompt", 100) == {"name": "Serum"}
+        assert cached_client.generate.call_count == 2
+        assert orjson.loads(entry.read_bytes()) == {"name": "Serum"}
+    
+    def test_use_cache_false_calls_llm(self, cached_client):
+        """Test that use_cache=False always calls the provider."""
+        cached_client.generate_json("System", "Prompt", 100)
+        cached_client.generate_json("System", "Prompt", 100, use_cache=False)
+        
+        assert cached_client.generate.call_count == 2
+    
+    def test_json_requests_use_zero_temperature(self, cached_client):
+        """Test that JSON generation samples deterministically."""
+        cached_client.generate_json("System", "Prompt", 100)
+        
+        assert cached_client.generate.call_args.kwargs["temperature"] == 0.0
+        assert cached_client.generate.call_args.kwargs["use_cache"] is False
+    
+    def test_retry_after_parse_failure_uses_nonzero_temperature(self, cached_client, monkeypatch):
+        """Test that a JSON retry samples instead of replaying the greedy reply."""
+        monkeypatch.setattr("src.llm_client.time.sleep", lambda seconds: None)
+        cached_client.generate.side_effect = ['{"name": "Ser', '{"name": "Serum"}']
+        
+        assert cached_client.generate_json("System", "Prompt", 100) == {"name": "Serum"}
+        temperatures = [c.kwargs["temperature"] for c in cached_client.generate.call_args_list]
+        assert temperatures[0] == 0.0
+        assert temperatures[1] > 0.0
@@ -0,0 +1,237 @@
+"""
+Tests for Utility Functions
+
+Unit tests for the file and dataset helpers in the utils module.
+"""
+
+import json
+import pytest
+
+from src.utils import (
+    load_json,
+    save_json,
+    write_json_output,
+    write_json_outputs,
+    load_dataset,
+    load_products_from_dataset,
+    load_product_from_dataset,
+    generate_timestamp,
+    append_jsonl,
+    read_jsonl,
+)
+
+
+class TestWriteJsonOutputs:
+    """Tests for the JSON output writers."""
+    
+    def test_write_json_outputs_writes_all_files(self, tmp_path):
+        """Test every item is written to its own file."""
+        output_dir = tmp_path / "out"
+        items = [
+            ({"faqs": ["a"]}, "faq.json"),
+            ({"name": "₹699 Serum"}, "product_page.json"),
+        ]
+        
+        written = write_json_outputs(items, str(output_dir))
+        
+        assert [p.split("/")[-1] for p in written] == ["faq.json", "product_page.json"]
+        assert json.loads((output_dir / "faq.json").read_text(encoding="utf-8")) == {"faqs": ["a"]}
+        assert "₹699" in (output_dir / "product_page.json").read_text(encoding="utf-8")
+    
+    def test_write_json_outputs_rejects_before_writing(self, tmp_path):
+        """Test a non-serializable item prevents the whole batch from being written."""
+        items = [
+            ({"ok": True}, "good.json"),
+            ({"bad": object()}, "bad.json"),
+        ]
+        
+        with pytest.raises(ValueError):
+            write_json_outputs(items, str(tmp_path))
+        
+        assert not (tmp_path / "good.json").exists()
+    
+    def test_failed_write_keeps_previous_file(self, tmp_path, monkeypatch):
+        """Test that an interrupted write leaves the old file and no temp files."""
+        write_json_output({"version": 1}, "page.json", str(tmp_path))
+        
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+        
+        monkeypatch.setattr("src.utils.os.replace", fail_replace)
+        with pytest.raises(IOError):
+            write_json_output({"version": 2}, "page.json", str(tmp_path))
+        
+        assert json.loads((tmp_path / "page.json").read_text(encoding="utf-8")) == {"version": 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["page.json"]
+    
+    def test_output_directory_created_once(self, tmp_path, monkeypatch):
+        """Test that repeat writes to one directory skip the mkdir call."""
+        from pathlib import Path
+        
+        calls = []
+        real_mkdir = Path.mkdir
+        monkeypatch.setattr(Path, "mkdir", lambda self, *a, **k: calls.append(self) or real_mkdir(self, *a, **k))
+        
+        output_dir = str(tmp_path / "pages")
+        write_json_output({"a": 1}, "one.json", output_dir)
+        write_json_output({"b": 2}, "two.json", output_dir)
+        
+        assert len(calls) == 1
+    
+    def test_output_directory_recreated_after_removal(self, tmp_path):
+        """Test that a directory deleted between writes is created again."""
+        import shutil
+        
+        output_dir = tmp_path / "pages"
+        write_json_output({"a": 1}, "one.json", str(output_dir))
+        shutil.rmtree(output_dir)
+        write_json_output({"b": 2}, "two.json", str(output_dir))
+        save_json({"c": 3}, str(tmp_path / "saved" / "three.json"))
+        shutil.rmtree(tmp_path / "saved")
+        save_json({"c": 4}, str(tmp_path / "saved" / "three.json"))
+        
+        assert json.loads((output_dir / "two.json").read_text(encoding="utf-8")) == {"b": 2}
+        assert load_json(str(tmp_path / "saved" / "three.json")) == {"c": 4}
+    
+    def test_ensure_directory_recreates_deleted_directory(self, tmp_path):
+        """Test that ensure_directory still creates a path it saw before if it was deleted."""
+        from src.utils import ensure_directory
+        
+        directory = tmp_path / "made"
+        ensure_directory(str(directory))
+        directory.rmdir()
+        ensure_directory(str(directory))
+        
+        assert directory.is_dir()
+    
+    def test_write_json_output_single_file(self, tmp_path):
+        """Test the single-file writer keeps its formatting."""
+        write_json_output({"a": 1}, "single.json", str(tmp_path))
+        
+        assert (tmp_path / "single.json").read_text(encoding="utf-8") == '{\n  "a": 1\n}'
+
+
+class TestLoadProducts:
+    """Tests for the dataset loaders."""
+    
+    @pytest.fixture
+    def dataset_path(self, tmp_path, sample_product_data):
+        """Write a two-product dataset and return its path."""
+        path = tmp_path / "products.json"
+        path.write_text(json.dumps({
+            "products": [sample_product_data, dict(sample_product_data, name="Second")]
+        }), encoding="utf-8")
+        return str(path)
+    
+    def test_load_products_returns_all(self, dataset_path):
+        """Test that every product is returned in order."""
+        products = load_products_from_dataset(dataset_path)
+        
+        assert [p["name"] for p in products] == ["Test Vitamin C Serum", "Second"]
+    
+    def test_load_products_rejects_empty(self, tmp_path):
+        """Test that an empty products list is an error."""
+        path = tmp_path / "empty.json"
+        path.write_text('{"products": []}', encoding="utf-8")
+        
+        with pytest.raises(ValueError):
+            load_products_from_dataset(str(path))
+    
+    def test_load_dataset_reads_current_file(self, dataset_path):
+        """Test that each load parses the file as it is now, not a stale copy."""
+        first = load_dataset(dataset_path)
+        first["products"].clear()
+        
+        assert len(load_dataset(dataset_path)["products"]) == 2
+        
+        with open(dataset_path, "w", encoding="utf-8") as f:
+            json.dump({"products": [{"name": "Edited"}]}, f)
+        
+        assert load_dataset(dataset_path)["products"][0]["name"] == "Edited"
+    
+    def test_load_product_returns_independent_copy(self, dataset_path):
+        """Test that mutating a loaded product does not leak into later loads."""
+        product = load_product_from_dataset(dataset_path, 0)
+        product["key_ingredients"].append("Extra")
+        
+        assert "Extra" not in load_product_from_dataset(dataset_path, 0)["key_ingredients"]
+    
+    def test_load_product_index_out_of_bounds(self, dataset_path):
+        """Test that an invalid index raises IndexError."""
+        assert load_product_from_dataset(dataset_path, 1)["name"] == "Second"
+        
+        with pytest.raises(IndexError):
+            load_product_from_dataset(dataset_path, 2)
+
+
+class TestJsonFiles:
+    """Tests for load_json/save_json."""
+    
+    def test_round_trip_keeps_unicode(self, tmp_path):
+        """Test that saved data loads back unchanged with non-ASCII text intact."""
+        path = tmp_path / "data" / "out.json"
+        data = {"name": "Serum", "price": "₹699", "tags": ["a", "b"]}
+        
+        save_json(data, str(path))
+        
+        assert load_json(str(path)) == data
+        assert "₹699" in path.read_text(encoding="utf-8")
+        assert path.read_text(encoding="utf-8").startswith('{\n  "name"')
+    
+    def test_other_indent_widths(self, tmp_path):
+        """Test that non-default indent values are honoured."""
+        path = tmp_path / "out.json"
+        
+        save_json({"a": 1}, str(path), indent=4)
+        assert path.read_text(encoding="utf-8") == '{\n    "a": 1\n}'
+        
+        save_json({"a": 1}, str(path), indent=None)
+        assert path.read_text(encoding="utf-8") == '{"a":1}'
+    
+    def test_jsonl_append_and_read(self, tmp_path):
+        """Test that appended records read back one per line in order."""
+        path = tmp_path / "dump" / "records.jsonl"
+        
+        append_jsonl({"name": "₹699 Serum"}, str(path))
+        append_jsonl({"name": "Second", "tags": [1, 2]}, str(path))
+        
+        assert path.read_bytes().count(b"\n") == 2
+        assert list(read_jsonl(str(path))) == [
+            {"name": "₹699 Serum"},
+            {"name": "Second", "tags": [1, 2]},
+        ]
+    
+    def test_append_jsonl_recreates_removed_directory(self, tmp_path):
+        """Test that appending after the directory was deleted starts a new file."""
+        import shutil
+        
+        path = tmp_path / "dump" / "records.jsonl"
+        append_jsonl({"run": 1}, str(path))
+        shutil.rmtree(path.parent)
+        append_jsonl({"run": 2}, str(path))
+        
+        assert list(read_jsonl(str(path))) == [{"run": 2}]
+    
+    def test_append_jsonl_rejects_unserializable(self, tmp_path):
+        """Test that a bad record raises ValueError and writes nothing."""
+        path = tmp_path / "records.jsonl"
+        
+        with pytest.raises(ValueError):
+            append_jsonl({"bad": object()}, str(path))
+        
+        assert not path.exists()
+
+
+class TestGenerateTimestamp:
+    """Tests for generate_timestamp."""
+    
+    def test_format_matches_datetime(self, monkeypatch):
+        """Test the cached formatter matches datetime's local-time output."""
+        from datetime import datetime
+        import src.utils as utils
+        
+        monkeypatch.setattr(utils.time, "time", lambda: 1_700_000_000.5)
+        
+        expected = datetime.fromtimestamp(1_700_000_000).strftime("%Y%m%d_%H%M%S")
+        assert generate_timestamp() == expected
+        assert generate_timestamp() is generate_timestamp()